@@ -5,8 +5,6 @@ from flask import Flask, request, jsonify, session # type: ignore
 from flask_session import Session # type: ignore
 from flask_cors import CORS # type: ignore
 from flask_bcrypt import Bcrypt # type: ignore
-from pymongo import MongoClient # type: ignore
-from pymongo.errors import ConnectionFailure, ConfigurationError
 from bson import ObjectId # type: ignore
 import json
 import difflib
@@ -17,11 +15,17 @@ os.environ["TF_ENABLE_ONEDNN_OPTS"] = "0"
 from datetime import datetime
 from dotenv import load_dotenv # type: ignore
 from faq_retrieval import traiter_question
-from chatbot_story import generer_storytelling , normalize_story, intro_narrative_programme, anecdote_aleatoire , format_events
+from chatbot_story import generer_storytelling , normalize_story, intro_narrative_programme, anecdote_aleatoire , format_events, tr
+from language_id import get_identifier, resolve_lang
 from audio_handler import text_to_speech
 from model_intents import predict_intent
 from nlp_engine import traiter_question_utilisateur
 from questions import get_bot_response  
+from logic.database import ReadOnlyBackendError, collection
+from logic.indexes import provision_at_startup
+from logic.answer_table import ANSWERS
+from logic.translation_cache import TRANSLATIONS
+from logic.catalog import CATALOG
 from logic.programmes import (
     get_programme_date_range_detailed,
     get_event_locations_detailed,
@@ -35,14 +39,14 @@ from logic.programmes import (
     get_programme_28_avril,
     get_programme_07_mai,
     get_programme_by_date_detailed,
-    get_programme_enfant_general_detailed
+    get_programme_enfant_general_detailed,
+    get_programmes_snapshot
 ) 
 
 
 # ────────────────────────────────────────────── # ⚙️ Config # ───────────────────────────────────────── #
 
 load_dotenv()
-MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/")
 SECRET_KEY = os.getenv("SECRET_KEY", "fallback_secret")
 #OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 app = Flask(__name__) 
@@ -56,31 +60,47 @@ Session(app)
 CORS(app, supports_credentials=True)
 
 bcrypt = Bcrypt(app)
+# 🔌 Collections MongoDB : client unique par processus, créé au premier
+# accès (après le fork des workers) — cf. logic/database.py
+programmes = collection("programmes_foire_2023")
+programmes_enfant = collection("programmes_enfant_2023")
+editeurs = collection("editeurs")
+users_collection = collection("comptes")
+childtracking = collection("child_tracking")
+infos_generales = collection("infos_generales")
+
+# 🗂️ Index requis par les requêtes : étape de migration (python -m logic.indexes ensure),
+# ici seulement si MONGO_ENSURE_INDEXES=1 — cf. logic/indexes.py
+provision_at_startup()
+
+# 📅 Instantané des programmes chargé dès le démarrage (hors chemin des requêtes)
 try:
-    if MONGO_URI:
-        client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000)  # Timeout de 5s
-        # 🔎 Test rapide de la connexion
-        client.admin.command("ping")
-        db = client["chatbotEvent"]
-        programmes = db["programmes_foire_2023"]
-        programmes_enfant = db["programmes_enfant_2023"]
-        editeurs = db["editeurs"]
-        users_collection = db["comptes"]
-        childtracking = db["child_tracking"]
-        infos_generales = db["infos_generales"]
-        print("✅ Connexion MongoDB réussie.")
-    else:
-        raise ValueError("❌ MONGO_URI non défini dans les variables d'environnement.")
-except (ConnectionFailure, ConfigurationError) as e:
-    print(f"⚠️ Erreur de connexion MongoDB : {e}")
-    client = None
-    db = None
-    programmes = None
-    programmes_enfant = None
-    users_collection = None
-    editeurs = None
-    childtracking = None 
-    infos_generales = None
+    get_programmes_snapshot()
+except Exception as e:
+    print(f"⚠️ Programmes non préchargés : {e}")
+
+# 🗂️ Catalogue compilé des textes statiques traduits (MESSAGE_CATALOG_ENABLED=0 le désactive)
+# — cf. logic/catalog.py
+if CATALOG is not None:
+    try:
+        n_messages = CATALOG.load()
+        coverage = ", ".join(f"{l}={p:.0%}" for l, p in CATALOG.coverage().items())
+        print(f"🗂️ Catalogue des messages {CATALOG.version} : {n_messages} traduction(s) ({coverage})")
+    except Exception as e:
+        print(f"⚠️ Catalogue des messages non chargé : {e}")
+
+# 🌍 Traductions déjà connues (cache disque partagé) chargées en mémoire
+print(f"🌍 {TRANSLATIONS.preload()} traduction(s) préchargée(s)")
+
+# 🔤 Identification de langue entraînée au démarrage (hors chemin des requêtes)
+try:
+    get_identifier()
+except Exception as e:
+    print(f"⚠️ Identification de langue indisponible : {e}")
+
+# 🧮 Réponses des intentions sans paramètre, précalculées en arrière-plan
+ANSWERS.warm()
+
 # Helper to serialize MongoDB ObjectId
 def serialize_user(user):
     return {
@@ -88,19 +108,20 @@ def serialize_user(user):
         "username": user.get("username"),
     }
 
-def _markdown_from_answer(ans: dict, mode: str = "brief") -> str:
+def _markdown_from_answer(ans: dict, mode: str = "brief", lang: str = "fr") -> str:
     """Transforme une réponse {summary, details} en chaîne Markdown lisible."""
     if not isinstance(ans, dict):
         return str(ans)
 
     summary = (ans.get("summary") or "").strip()
     details = ans.get("details")
+    details_label = tr("label_details", lang)
 
     out = []
-    out.append(f"- **Résumé**\n  {summary if summary else '—'}")
+    out.append(f"- **{tr('label_summary', lang)}**\n  {summary if summary else '—'}")
 
     if isinstance(details, list):
-        out.append("- **Détails**")
+        out.append(f"- **{details_label}**")
         for item in details:
             if isinstance(item, dict):
                 titre = item.get("titre") or item.get("nom") or item.get("date") or "Événement"
@@ -112,7 +133,7 @@ def _markdown_from_answer(ans: dict, mode: str = "brief") -> str:
             else:
                 out.append(f"- {item}")
     elif isinstance(details, dict):
-        out.append("- **Détails**")
+        out.append(f"- **{details_label}**")
         for k, v in details.items():
             if isinstance(v, (dict, list)):
                 out.append(f"- **{k.capitalize()}** : {str(v)}")
@@ -123,12 +144,12 @@ def _markdown_from_answer(ans: dict, mode: str = "brief") -> str:
         if det:
             lines = [l.strip() for l in det.split("\n") if l.strip()]
             if len(lines) > 1:
-                out.append("- **Détails**")
+                out.append(f"- **{details_label}**")
                 out.extend([f"- {l}" for l in lines])
             else:
-                out.append(f"- **Détails**\n  {det}")
+                out.append(f"- **{details_label}**\n  {det}")
         else:
-            out.append("- **Détails**\n  —")
+            out.append(f"- **{details_label}**\n  —")
 
     return "\n".join(out)
 
@@ -295,12 +316,18 @@ def ask():
 
         print(f"\n[ASK] 🔎 Message reçu : {user_message}")
 
+        # 🔤 Langue de la réponse : choisie par le front-end, sinon détectée localement
+        lang = resolve_lang(data.get("lang"), user_message)
+        print(f"[ASK] 🔤 Langue : {lang}")
+
         # --- 2️⃣ Étape : Prédiction de l’intention ---
         try:
             intent_data = predict_intent(user_message)
             intent = intent_data.get("intent", "unknown")
             confidence = float(intent_data.get("confidence", 0.0))
-            print(f"[ASK] 🎯 Intent détecté : {intent} (confiance = {confidence:.2f})")
+            margin = float(intent_data.get("margin", confidence))
+            print(f"[ASK] 🎯 Intent détecté : {intent} (confiance = {confidence:.2f}, marge = {margin:.2f}, "
+                  f"étage = {intent_data.get('tier', '?')})")
         except Exception as e:
             print(f"[ERREUR INTENT MODEL] {e}")
             intent = "unknown"
@@ -328,20 +355,40 @@ def ask():
             try:
                 func = mapping[intent]
 
+                # ⚡ Réponse précalculée (table matérialisée) si disponible
+                result = ANSWERS.lookup(intent, lang=lang, question=user_message)
+                if result is None and lang != "fr":
+                    # Pas de réponse pré-localisée : français plutôt qu'une traduction distante
+                    print(f"[ASK] 🔤 Aucune réponse pré-localisée ({lang}) pour {intent} → fr")
+                    lang = "fr"
+                    result = ANSWERS.lookup(intent, lang=lang, question=user_message)
+                params = func.__code__.co_varnames[:func.__code__.co_argcount]
+                lang_kwargs = {"lang": lang} if "lang" in params else {}
+                if result is not None:
+                    print(f"[ASK] ⚡ Réponse précalculée pour {intent} ({lang})")
                 # 🔍 Déterminer si la fonction accepte un argument
-                if func.__code__.co_argcount == 0:
+                elif func.__code__.co_argcount - len(lang_kwargs) <= 0:
                     print(f"[ASK] 🚀 Appel de {func.__name__}() sans argument")
-                    result = func()
+                    result = func(**lang_kwargs)
                 else:
                     print(f"[ASK] 🚀 Appel de {func.__name__}('{user_message}')")
-                    result = func(user_message)
+                    result = func(user_message, **lang_kwargs)
 
                 # --- 🧩 Storytelling contextuel ---
                 if "programme" in intent:
                     print("[ASK] 📖 Génération du storytelling (programme)...")
                     from chatbot_story import generer_storytelling
-                    story = generer_storytelling(result, question=user_message)
-                    final_answer = story.get("details", "Aucune donnée détaillée.")
+                    story = generer_storytelling(result, question=user_message, lang=lang)
+                    final_answer = story.get("details", tr("no_info", lang))
+
+                elif ("editeur" in intent or "editor" in intent) and lang != "fr":
+                    # Narration française non traduite : résumé et pays pré-localisés seulement
+                    from chatbot_story import format_editors_countries
+                    formatted = format_editors_countries(result) if isinstance(result, dict) else {}
+                    if formatted.get("details"):
+                        final_answer = f"{formatted['summary']}\n\n{', '.join(formatted['details'])}."
+                    else:
+                        final_answer = _markdown_from_answer(result, lang=lang)
 
                 elif "editeur" in intent or "editor" in intent:
                     print("[ASK] 📖 Génération du storytelling (éditeurs/pays)...")
@@ -358,7 +405,7 @@ def ask():
                     final_answer = f"{intro}\n\n🌍 Pays représentés : {countries_text}.\n\n{conclusion}"
 
                 else:
-                    final_answer = result
+                    final_answer = _markdown_from_answer(result, lang=lang)
 
                 # --- 🎧 Conversion en audio (uniquement si mode audio) ---
                 from audio_handler import text_to_speech
@@ -369,12 +416,13 @@ def ask():
 
                 b64_tts = None
                 if input_mode == "audio":
-                    b64_tts = text_to_speech(final_answer, language="fr")
+                    b64_tts = text_to_speech(final_answer, language=lang)
                     print("[ASK] 🔊 TTS généré pour mode audio.")
 
                 return jsonify({
                     "answer": final_answer,
-                    "audio": b64_tts
+                    "audio": b64_tts,
+                    "lang": lang
                 }), 200
 
             except Exception as e:
@@ -385,9 +433,7 @@ def ask():
 
         # --- 5️⃣ Si aucune correspondance d’intent trouvée ---
         if intent == "unknown" or confidence < 0.3:
-            return jsonify({
-                "answer": "🤔 Désolé, je n’ai trouvé aucune donnée correspondant précisément à votre demande."
-            }), 200
+            return jsonify({"answer": tr("no_match", lang), "lang": lang}), 200
 
         # --- 6️⃣ Lecture fallback depuis intents_data.json ---
         try:
@@ -400,15 +446,15 @@ def ask():
                     answer = random.choice(responses)
                     from audio_handler import text_to_speech
                     b64_tts = text_to_speech(answer, language="fr")
-                    return jsonify({"answer": answer, "audio": b64_tts}), 200
+                    return jsonify({"answer": answer, "audio": b64_tts, "lang": "fr"}), 200
         except Exception as e:
             print(f"[ERREUR LECTURE INTENTS] {e}")
 
         # --- 7️⃣ Dernier recours ---
-        neutral_msg = "Je n’ai pas trouvé d’information exacte à ce sujet."
+        neutral_msg = tr("no_exact_info", lang)
         from audio_handler import text_to_speech
-        b64_tts = text_to_speech(neutral_msg, language="fr")
-        return jsonify({"answer": neutral_msg, "audio": b64_tts}), 200
+        b64_tts = text_to_speech(neutral_msg, language=lang)
+        return jsonify({"answer": neutral_msg, "audio": b64_tts, "lang": lang}), 200
 
     except Exception as e:
         print(f"[ERREUR GLOBALE /api/ask] {e}")
@@ -497,8 +543,9 @@ def chatbot_general():
     }
     mode = map_mode.get(mode_input, "brief")
 
-    # 1️⃣ FAQ direct
-    faq_answer = traiter_question(question, response_type=mode)
+    # 1️⃣ FAQ direct (réponses déjà traduites dans FAQ_RESPONSES)
+    lang = resolve_lang(data.get("lang"), question)
+    faq_answer = traiter_question(question, response_type=mode, lang=lang)
     if faq_answer and not faq_answer.startswith("⚠️") and not faq_answer.startswith("❌"):
         return jsonify({"response": faq_answer}), 200
 
@@ -525,6 +572,11 @@ def programme_duration():
 def programme_by_date(date_str):
     return jsonify(get_programme_by_date_detailed(date_str))
 
+@app.errorhandler(ReadOnlyBackendError)
+def handle_read_only_backend(e):
+    # Comptes et suivi des enfants indisponibles sans MongoDB (DATA_BACKEND=local)
+    return jsonify({"error": "Service temporairement indisponible : données en lecture seule."}), 503
+
 @app.errorhandler(Exception)
 def handle_exception(e):
     return jsonify({"error": str(e)}), 500
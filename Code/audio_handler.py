@@ -23,6 +23,7 @@ LANG_MAP = {
     "de": {"speech": "de-DE", "tts": "de"},
     "es": {"speech": "es-ES", "tts": "es"},
     "ja": {"speech": "ja-JP", "tts": "ja"},
+    "zh": {"speech": "zh-CN", "tts": "zh-CN"},
 }
 
 # ---------------------------------------------------------------------
@@ -2,10 +2,10 @@
 
 import os
 import random
-from pymongo import MongoClient  # type: ignore
 from dotenv import load_dotenv  # type: ignore
 from datetime import datetime
 from questions import get_bot_response  # fallback si besoin
+from logic.dates import format_date_fr
 
 # =========================================================
 # 🌍 MULTI-LANGUE (i18n)
@@ -23,6 +23,22 @@ I18N = {
         "ja": "この質問に関する情報はありません。",
         "zh": "暂无关于此问题的信息。"
     },
+    "no_match": {
+        "fr": "🤔 Désolé, je n’ai trouvé aucune donnée correspondant précisément à votre demande.",
+        "en": "🤔 Sorry, I couldn't find any data matching your request precisely.",
+        "de": "🤔 Leider habe ich keine Daten gefunden, die genau zu Ihrer Anfrage passen.",
+        "ar": "🤔 عذرًا، لم أجد أي بيانات تطابق طلبك بدقة.",
+        "ja": "🤔 申し訳ありませんが、ご質問に正確に対応するデータが見つかりませんでした。",
+        "zh": "🤔 抱歉，我没有找到与您的请求完全匹配的数据。"
+    },
+    "no_exact_info": {
+        "fr": "Je n’ai pas trouvé d’information exacte à ce sujet.",
+        "en": "I couldn't find exact information on this topic.",
+        "de": "Ich habe keine genauen Informationen zu diesem Thema gefunden.",
+        "ar": "لم أجد معلومات دقيقة حول هذا الموضوع.",
+        "ja": "この件に関する正確な情報は見つかりませんでした。",
+        "zh": "我没有找到关于此主题的确切信息。"
+    },
     "intro_narrative_programme": {
         "fr": "📅 Le programme du {date} propose {n} moment(s) fort(s).",
         "en": "📅 The program for {date} includes {n} key event(s).",
@@ -30,6 +46,22 @@ I18N = {
         "ar": "📅 برنامج يوم {date} يتضمن {n} فعالية.",
         "ja": "📅 {date} のプログラムには {n} 件のイベントがあります。",
         "zh": "📅 {date} 的活动安排包含 {n} 项活动。"
+    },
+    "label_summary": {
+        "fr": "Résumé",
+        "en": "Summary",
+        "de": "Zusammenfassung",
+        "ar": "ملخص",
+        "ja": "概要",
+        "zh": "摘要"
+    },
+    "label_details": {
+        "fr": "Détails",
+        "en": "Details",
+        "de": "Details",
+        "ar": "التفاصيل",
+        "ja": "詳細",
+        "zh": "详情"
     }
 }
 
@@ -45,20 +77,12 @@ load_dotenv()
 MONGO_URI = os.getenv("MONGO_URI")
 
 # -------------------------
-# Connexion MongoDB
+# Collections (MongoDB ou backend local, cf. logic/database.py)
 # -------------------------
-if MONGO_URI:
-    client = MongoClient(MONGO_URI)
-    db = client["chatbotEvent"]
-    programmes = db.get_collection("programmes_foire_2023")
-    programmes_enfant = db.get_collection("programmes_enfant_2023")
-    editeurs = db.get_collection("editeurs_foire")
-else:
-    client = None
-    db = None
-    programmes = None
-    programmes_enfant = None
-    editeurs = None
+from logic.database import collection
+programmes = collection("programmes_foire_2023")
+programmes_enfant = collection("programmes_enfant_2023")
+editeurs = collection("editeurs_foire")
 
 
 # -------------------------
@@ -114,7 +138,7 @@ def format_date(date_str: str) -> str:
         return "le 28 Avril"
     try:
         dt = datetime.strptime(date_str, "%Y-%m-%d")
-        return dt.strftime("%d %B %Y")
+        return format_date_fr(dt, year=True)
     except Exception:
         return str(date_str)
 
@@ -228,9 +252,10 @@ def generer_storytelling(
         f"- {s.get('titre', '—')}" for s in sessions_list
     )
 
-    conclusion = anecdote_aleatoire("programmes")
+    # Recommandations rédigées en français uniquement
+    conclusion = anecdote_aleatoire("programmes") if lang == "fr" else ""
 
-    final_text = f"{intro}\n\n{details}\n\n{conclusion}"
+    final_text = f"{intro}\n\n{details}\n\n{conclusion}".strip()
     return normalize_story(intro, final_text)
 
 
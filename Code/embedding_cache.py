@@ -0,0 +1,80 @@
+"""
+embedding_cache.py
+Cache LRU borné (avec TTL optionnel) des embeddings de questions.
+Clé = texte normalisé par model_intents.clean_text (+ nom de l'encodeur) :
+une question déjà posée ne repasse plus par le transformer.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """LRU thread-safe ; vecteurs stockés en float32 ou float16 compacts."""
+
+    def __init__(self, max_size: int = 4096, ttl: Optional[float] = None,
+                 dtype=np.float32):
+        self.max_size = max(int(max_size), 0)
+        self.ttl = ttl if ttl and ttl > 0 else None
+        self.dtype = np.dtype(dtype)
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple[float, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._data[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, vector: np.ndarray) -> None:
+        if self.max_size == 0:
+            return
+        vec = np.ascontiguousarray(vector, dtype=self.dtype)
+        vec.setflags(write=False)
+        with self._lock:
+            self._data[key] = (time.monotonic(), vec)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+                "dtype": self.dtype.name,
+            }
+
+
+def cache_from_env() -> EmbeddingCache:
+    """
+    INTENTS_EMBED_CACHE_SIZE (0 = désactivé), INTENTS_EMBED_CACHE_TTL (secondes),
+    INTENTS_EMBED_CACHE_DTYPE (float32 | float16).
+    """
+    return EmbeddingCache(
+        max_size=int(os.getenv("INTENTS_EMBED_CACHE_SIZE", "4096")),
+        ttl=float(os.getenv("INTENTS_EMBED_CACHE_TTL", "0")),
+        dtype=os.getenv("INTENTS_EMBED_CACHE_DTYPE", "float32"),
+    )
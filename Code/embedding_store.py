@@ -0,0 +1,61 @@
+"""
+embedding_store.py
+Stock persistant, adressé par contenu, des embeddings des patterns
+d'entraînement (hash(modèle + pattern nettoyé) → vecteur), sauvegardé en
+.npz à côté du modèle. train_and_save n'encode plus que les patterns
+nouveaux ou modifiés.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+
+STORE_FILE = "pattern_embeddings.npz"
+
+
+def pattern_key(model_name: str, cleaned: str) -> str:
+    return hashlib.sha1(f"{model_name}\0{cleaned}".encode("utf-8")).hexdigest()
+
+
+class PatternEmbeddingStore:
+    def __init__(self, vectors: dict[str, np.ndarray] | None = None):
+        self._vectors = vectors or {}
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._vectors
+
+    @classmethod
+    def load(cls, path: str | Path) -> "PatternEmbeddingStore":
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                keys, vectors = data["keys"], data["vectors"]
+                return cls({str(k): vectors[i] for i, k in enumerate(keys)})
+        except Exception as e:
+            print(f"[WARN] Stock d’embeddings illisible ({e}) → réencodage complet")
+            return cls()
+
+    def get(self, key: str) -> np.ndarray:
+        return self._vectors[key]
+
+    def update(self, keys: list[str], vectors: np.ndarray) -> None:
+        for k, v in zip(keys, vectors):
+            self._vectors[k] = np.asarray(v, dtype=np.float32)
+
+    def save(self, path: str | Path, keep: set[str] | None = None) -> None:
+        """Écriture atomique ; keep limite le stock aux patterns encore présents."""
+        path = Path(path)
+        keys = [k for k in self._vectors if keep is None or k in keep]
+        vectors = (np.vstack([self._vectors[k] for k in keys]) if keys
+                   else np.zeros((0, 0), dtype=np.float32))
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, keys=np.asarray(keys, dtype="U40"), vectors=vectors.astype(np.float32))
+        os.replace(tmp, path)
@@ -5,8 +5,9 @@ Module pour récupérer des réponses depuis la FAQ.
 """
 
 import re
-import unicodedata
+from text_normalizer import normalize_for_matching
 from text_corrector import corriger_texte  # Corrige le texte selon le mode (brief/detailed)
+import keyword_matcher
 
 # ──────────────
 # 🌍 Base FAQ multilingue avec synonymes
@@ -18,6 +19,9 @@ FAQ_DATABASE = {
     "paiement": ["paiement", "payer", "carte", "paypal", "cash", "espèces", "payment", "credit card"],
 }
 
+# Synonymes compilés une fois dans l'automate partagé (mots entiers, ordre = priorité)
+keyword_matcher.register("faq", FAQ_DATABASE.items(), whole_word=True)
+
 FAQ_RESPONSES = {
     "horaires": {
         "fr": "⏰ La foire est ouverte tous les jours de 9h à 19h.",
@@ -58,13 +62,7 @@ FAQ_RESPONSES = {
 # ──────────────
 def nettoyer_texte(text: str) -> str:
     """Nettoie et normalise le texte pour la comparaison."""
-    text = text.lower()
-    text = ''.join(
-        c for c in unicodedata.normalize('NFD', text)
-        if unicodedata.category(c) != 'Mn'
-    )
-    text = re.sub(r"[?.!,:;]", "", text)
-    return text.strip()
+    return normalize_for_matching(text)
 
 # ──────────────
 # 🧩 Recherche FAQ
@@ -74,11 +72,10 @@ def obtenir_response(user_question: str, lang: str = "fr") -> str | None:
     user_question = nettoyer_texte(user_question)
     lang = lang.lower().strip()
 
-    for key, synonyms in FAQ_DATABASE.items():
-        for syn in synonyms:
-            if re.search(r"\b" + re.escape(syn) + r"\b", user_question):
-                response_dict = FAQ_RESPONSES.get(key, {})
-                return response_dict.get(lang, response_dict.get("fr", "Réponse indisponible."))
+    key = keyword_matcher.first_match(user_question, "faq")
+    if key:
+        response_dict = FAQ_RESPONSES.get(key, {})
+        return response_dict.get(lang, response_dict.get("fr", "Réponse indisponible."))
     return None
 
 # ──────────────
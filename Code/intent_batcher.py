@@ -0,0 +1,91 @@
+"""
+intent_batcher.py
+Micro-batching inter-requêtes pour l'encodeur d'intentions.
+Les appels concurrents (/api/ask, /chatbot) déposent leur question dans une
+file ; un thread unique les regroupe pendant une fenêtre courte (ou jusqu'à
+N questions) puis exécute UNE seule passe de l'encodeur et redistribue les
+résultats aux requêtes en attente.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional
+
+
+class MicroBatcher:
+    """
+    batch_fn(items) -> results (même longueur, même ordre).
+    Latence ajoutée bornée par window_ms ; débit multiplié sous charge.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Any]], List[Any]],
+                 window_ms: float = 3.0, max_batch: int = 16):
+        self._batch_fn = batch_fn
+        self._window = max(window_ms, 0.0) / 1000.0
+        self._max_batch = max(int(max_batch), 1)
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._queue: "queue.Queue[tuple[Any, Future]]" = queue.Queue()
+
+    def submit(self, item: Any) -> Future:
+        self._ensure_worker()
+        fut: Future = Future()
+        self._queue.put((item, fut))
+        return fut
+
+    def __call__(self, item: Any, timeout: Optional[float] = None) -> Any:
+        return self.submit(item).result(timeout=timeout)
+
+    # -----------------------------------------------------------------
+    def _ensure_worker(self) -> None:
+        # Démarrage paresseux et redémarrage après fork (workers gunicorn)
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue()
+            threading.Thread(target=self._run, name="intent-batcher", daemon=True).start()
+            self._pid = os.getpid()
+
+    def _collect(self) -> list:
+        pending = [self._queue.get()]
+        deadline = time.monotonic() + self._window
+        while len(pending) < self._max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    pending.append(self._queue.get_nowait())
+                else:
+                    pending.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return pending
+
+    def _run(self) -> None:
+        while True:
+            pending = self._collect()
+            items = [item for item, _ in pending]
+            try:
+                results = self._batch_fn(items)
+            except Exception as e:
+                for _, fut in pending:
+                    fut.set_exception(e)
+                continue
+            for (_, fut), res in zip(pending, results):
+                fut.set_result(res)
+
+
+def batcher_from_env(batch_fn: Callable[[List[Any]], List[Any]]) -> Optional[MicroBatcher]:
+    """
+    INTENTS_BATCH_WINDOW_MS (ex. 2–5) active le micro-batching ; 0 = désactivé.
+    INTENTS_BATCH_MAX borne la taille d'un lot.
+    """
+    window_ms = float(os.getenv("INTENTS_BATCH_WINDOW_MS", "0"))
+    if window_ms <= 0:
+        return None
+    max_batch = int(os.getenv("INTENTS_BATCH_MAX", "16"))
+    return MicroBatcher(batch_fn, window_ms=window_ms, max_batch=max_batch)
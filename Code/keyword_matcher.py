@@ -0,0 +1,157 @@
+"""
+keyword_matcher.py
+Moteur de mots-clés Aho–Corasick partagé par la détection de mode
+(mode_detector), la FAQ (faq_retrieval) et les renforcements d'intention
+(model_intents).
+
+Chaque module enregistre sa table une fois à l'import ; l'automate est
+compilé paresseusement et une question normalisée est parcourue en UN seul
+passage linéaire, qui renvoie tous les mots-clés trouvés avec leur catégorie.
+"""
+
+import re
+import threading
+from collections import deque
+from functools import lru_cache
+from typing import Iterable, NamedTuple, Optional
+
+from text_normalizer import fold
+
+
+class Hit(NamedTuple):
+    start: int
+    end: int
+    keyword: str
+    group: str     # ex. "mode", "faq", "boost"
+    label: str     # ex. "detaille", "horaires", "get_programme_07_mai"
+    rank: int      # ordre d'enregistrement du label dans son groupe (priorité)
+
+
+# Écritures sans espaces entre les mots (kana, idéogrammes) : pas de frontière de mot
+_UNSPACED = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]")
+
+
+def _is_word(c: str) -> bool:
+    """Caractère qui prolonge un mot (whole_word) ; jamais vrai en japonais/chinois."""
+    return (c.isalnum() or c == "_") and not _UNSPACED.match(c)
+
+
+class KeywordMatcher:
+    """Automate d'Aho–Corasick (trie + liens d'échec)."""
+
+    def __init__(self):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[tuple]] = [[]]
+        self._built = False
+
+    def add(self, keyword: str, group: str, label: str, rank: int, whole_word: bool = False) -> None:
+        kw = fold(keyword)
+        if not kw.strip():
+            return
+        node = 0
+        for c in kw:
+            nxt = self._goto[node].get(c)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][c] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((kw, group, label, rank, whole_word))
+        self._built = False
+
+    def build(self) -> "KeywordMatcher":
+        queue = deque()
+        for nxt in self._goto[0].values():
+            self._fail[nxt] = 0
+            queue.append(nxt)
+        while queue:
+            node = queue.popleft()
+            for c, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and c not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(c, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+        self._built = True
+        return self
+
+    def scan(self, folded: str) -> list[Hit]:
+        """Tous les mots-clés présents dans un texte déjà normalisé (fold)."""
+        if not self._built:
+            self.build()
+        hits = []
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        n = len(folded)
+        for i, c in enumerate(folded):
+            while node and c not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(c, 0)
+            for kw, group, label, rank, whole_word in out[node]:
+                start = i - len(kw) + 1
+                if whole_word:
+                    if _is_word(kw[0]) and start > 0 and _is_word(folded[start - 1]):
+                        continue
+                    if _is_word(kw[-1]) and i + 1 < n and _is_word(folded[i + 1]):
+                        continue
+                hits.append(Hit(start, i + 1, kw, group, label, rank))
+        return hits
+
+
+# ---------------------------------------------------------------------
+# Automate partagé
+# ---------------------------------------------------------------------
+_TABLES: list[tuple[str, list[tuple[str, list[str]]], bool]] = []
+_SHARED: Optional[KeywordMatcher] = None
+_LOCK = threading.Lock()
+
+
+def register(group: str, table: Iterable[tuple[str, Iterable[str]]], whole_word: bool = False) -> None:
+    """
+    Enregistre une table ordonnée [(label, [mots-clés…]), …] sous un groupe.
+    L'ordre des labels donne leur priorité (cf. first_match).
+    """
+    global _SHARED
+    with _LOCK:
+        _TABLES.append((group, [(label, list(kws)) for label, kws in table], whole_word))
+        _SHARED = None
+        _scan_folded.cache_clear()
+
+
+def _matcher() -> KeywordMatcher:
+    global _SHARED
+    matcher = _SHARED
+    if matcher is None:
+        with _LOCK:
+            if _SHARED is None:
+                m = KeywordMatcher()
+                for group, table, whole_word in _TABLES:
+                    for rank, (label, keywords) in enumerate(table):
+                        for kw in keywords:
+                            m.add(kw, group, label, rank, whole_word)
+                _SHARED = m.build()
+            matcher = _SHARED
+    return matcher
+
+
+@lru_cache(maxsize=512)
+def _scan_folded(folded: str) -> tuple[Hit, ...]:
+    return tuple(_matcher().scan(folded))
+
+
+def scan(text: str) -> tuple[Hit, ...]:
+    """Un passage sur la question ; mémoïsé pour que les étapes d'une même requête le partagent."""
+    return _scan_folded(fold(text))
+
+
+def first_match(text: str, group: str) -> Optional[str]:
+    """Label de plus haute priorité trouvé pour ce groupe (None si aucun)."""
+    best = None
+    for hit in scan(text):
+        if hit.group == group and (best is None or hit.rank < best.rank):
+            best = hit
+    return best.label if best else None
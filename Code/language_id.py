@@ -0,0 +1,185 @@
+"""
+language_id.py
+Identification locale de la langue du visiteur (fr, en, de, ar, ja, zh) :
+- écriture d'abord : arabe → ar, kana → ja, idéogrammes seuls → zh ;
+- sinon Bayes naïf sur n-grammes de caractères (1 à 3), entraîné au
+  démarrage sur nos propres tables : intents_data.json (fr), indices de
+  mode par langue (mode_detector), tables multilingues (FAQ_RESPONSES,
+  I18N, LABELS, FALLBACKS) et catalogue des messages (i18n/messages.json) ;
+- texte trop court (moins de MIN_WORDS mots) ou verdict incertain → langue
+  par défaut (fr) : « merci beaucoup » ne fait pas quitter le français.
+Quelques microsecondes par question, sans appel réseau.
+"""
+
+import ast
+import json
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+CODE_DIR = Path(__file__).resolve().parent
+LANGS = ("fr", "en", "de", "ar", "ja", "zh")
+DEFAULT_LANG = "fr"
+
+# Modules dont les dictionnaires indexés par langue servent d'exemples
+MULTILINGUAL_SOURCES = ("faq_retrieval.py", "chatbot_story.py", "logic/translator.py")
+
+NGRAM_SIZES = (1, 2, 3)
+SMOOTHING = 0.5
+MIN_LETTERS = 4
+# En dessous, les n-grammes ne suffisent pas à départager fr / en / de
+MIN_WORDS = 3
+# Écart minimal de log-probabilité moyen par n-gramme entre les deux premières langues
+MIN_MARGIN = 0.1
+
+_NON_LETTERS = re.compile(r"[\W\d_]+")
+_ARABIC = re.compile(r"[؀-ۿݐ-ݿ]")
+_KANA = re.compile(r"[぀-ヿ]")
+_HAN = re.compile(r"[一-鿿]")
+
+
+# ---------------------------------------------------------------------
+# Données d'entraînement
+# ---------------------------------------------------------------------
+def _lang_table_strings(path: Path) -> Iterator[tuple[str, str]]:
+    """(langue, texte) de chaque dictionnaire littéral indexé par code de langue."""
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Dict) and len(node.keys) >= 2 and all(
+                isinstance(k, ast.Constant) and k.value in LANGS for k in node.keys)):
+            continue
+        for k, v in zip(node.keys, node.values):
+            for leaf in ast.walk(v):
+                if isinstance(leaf, ast.Constant) and isinstance(leaf.value, str):
+                    yield k.value, leaf.value
+
+
+def training_samples() -> list[tuple[str, str]]:
+    samples = []
+
+    with open(CODE_DIR / "intents_data.json", encoding="utf-8") as f:
+        for intent in json.load(f):
+            samples.extend(("fr", p) for p in intent.get("patterns", []))
+
+    from mode_detector import BRIEF_HINTS, DETAILED_HINTS_BY_LANG
+    samples.extend(("fr", h) for h in BRIEF_HINTS)
+    for lang, hints in DETAILED_HINTS_BY_LANG.items():
+        samples.extend((lang, h) for h in hints)
+
+    for rel in MULTILINGUAL_SOURCES:
+        samples.extend(_lang_table_strings(CODE_DIR / rel))
+
+    try:
+        from logic.catalog import read_catalog
+        for fr, translations in read_catalog().get("messages", {}).items():
+            samples.append(("fr", fr))
+            samples.extend((lang, text) for lang, text in translations.items() if lang in LANGS)
+    except Exception as e:
+        print(f"[WARN] Identification de langue : catalogue ignoré ({e})")
+    return samples
+
+
+# ---------------------------------------------------------------------
+# Modèle
+# ---------------------------------------------------------------------
+def _letters(text: str) -> str:
+    return " ".join(_NON_LETTERS.sub(" ", text.lower()).split())
+
+
+def _ngrams(text: str) -> Iterator[str]:
+    padded = f" {text} "
+    for n in NGRAM_SIZES:
+        for i in range(len(padded) - n + 1):
+            gram = padded[i:i + n]
+            if gram != " " * n:
+                yield gram
+
+
+def _by_script(text: str) -> Optional[str]:
+    if _KANA.search(text):
+        return "ja"
+    arabic = len(_ARABIC.findall(text))
+    if arabic and arabic * 2 >= sum(c.isalpha() for c in text):
+        return "ar"
+    if _HAN.search(text):
+        return "zh"
+    return None
+
+
+class LanguageIdentifier:
+    def __init__(self, langs: Iterable[str] = LANGS, smoothing: float = SMOOTHING):
+        self.langs = tuple(langs)
+        self._smoothing = smoothing
+        self._logp: dict[str, tuple[float, ...]] = {}
+        self._unseen: tuple[float, ...] = (0.0,) * len(self.langs)
+
+    def fit(self, samples: Iterable[tuple[str, str]]) -> "LanguageIdentifier":
+        counts = defaultdict(Counter)
+        for lang, text in samples:
+            if lang in self.langs:
+                counts[lang].update(_ngrams(_letters(text)))
+        vocab = set().union(*counts.values()) if counts else set()
+        denom = [sum(counts[l].values()) + self._smoothing * (len(vocab) + 1) for l in self.langs]
+        # Une ligne de log-probabilités par n-gramme : une seule somme par langue à la prédiction
+        self._logp = {
+            gram: tuple(math.log((counts[l][gram] + self._smoothing) / d)
+                        for l, d in zip(self.langs, denom))
+            for gram in vocab
+        }
+        self._unseen = tuple(math.log(self._smoothing / d) for d in denom)
+        return self
+
+    def scores(self, text: str) -> tuple[list[float], int]:
+        totals = [0.0] * len(self.langs)
+        n = 0
+        logp, unseen = self._logp, self._unseen
+        for gram in _ngrams(_letters(text)):
+            row = logp.get(gram, unseen)
+            for i, v in enumerate(row):
+                totals[i] += v
+            n += 1
+        return totals, n
+
+    def predict(self, text: str, default: str = DEFAULT_LANG) -> tuple[str, float]:
+        """(langue, marge moyenne par n-gramme) ; `default` si incertain."""
+        script = _by_script(text or "")
+        if script:
+            return script, 1.0
+        if sum(c.isalpha() for c in text or "") < MIN_LETTERS or len(_letters(text).split()) < MIN_WORDS:
+            return default, 0.0
+        totals, n = self.scores(text)
+        if not n:
+            return default, 0.0
+        ranked = sorted(zip(totals, self.langs), reverse=True)
+        margin = (ranked[0][0] - ranked[1][0]) / n
+        return (ranked[0][1], margin) if margin >= MIN_MARGIN else (default, margin)
+
+
+_identifier: Optional[LanguageIdentifier] = None
+_lock = threading.Lock()
+
+
+def get_identifier() -> LanguageIdentifier:
+    global _identifier
+    if _identifier is None:
+        with _lock:
+            if _identifier is None:
+                _identifier = LanguageIdentifier().fit(training_samples())
+    return _identifier
+
+
+def detect_language(text: str, default: str = DEFAULT_LANG) -> str:
+    try:
+        return get_identifier().predict(text, default)[0]
+    except Exception as e:
+        print(f"[WARN] Identification de langue impossible : {e}")
+        return default
+
+
+def resolve_lang(requested: Optional[str], text: str, default: str = DEFAULT_LANG) -> str:
+    """Langue demandée explicitement par le front-end, sinon détectée."""
+    requested = (requested or "").strip().lower()
+    return requested if requested in LANGS else detect_language(text, default)
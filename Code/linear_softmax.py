@@ -0,0 +1,80 @@
+"""
+linear_softmax.py
+Inférence NumPy brute pour les LogisticRegression de classifier.joblib /
+tfidf_classifier.joblib : coef_/intercept_ extraits une fois en tableaux
+contigus, softmax calculé dans un buffer préalloué (par thread) pour le
+cas d'une seule question, top-k + marge sans second appel au modèle.
+"""
+
+import threading
+
+import numpy as np
+
+
+class LinearSoftmax:
+    """Équivalent de LogisticRegression.predict_proba sans validation sklearn."""
+
+    def __init__(self, coef: np.ndarray, intercept: np.ndarray, ovr: bool = False):
+        self._coef_t = np.ascontiguousarray(np.asarray(coef, dtype=np.float32).T)
+        self._intercept = np.ascontiguousarray(intercept, dtype=np.float32)
+        self._binary = self._coef_t.shape[1] == 1
+        self._ovr = ovr
+        self.n_classes = 2 if self._binary else self._coef_t.shape[1]
+        self._local = threading.local()
+
+    @classmethod
+    def from_sklearn(cls, clf) -> "LinearSoftmax":
+        if not (hasattr(clf, "coef_") and hasattr(clf, "intercept_")):
+            raise TypeError(f"{type(clf).__name__} n'est pas un modèle linéaire")
+        ovr = getattr(clf, "multi_class", "auto") == "ovr" or getattr(clf, "solver", "") == "liblinear"
+        return cls(clf.coef_, clf.intercept_, ovr=ovr)
+
+    # -----------------------------------------------------------------
+    def predict_proba(self, X) -> np.ndarray:
+        """Probabilités pour un lot (dense ou creux) — nouveau tableau."""
+        if hasattr(X, "toarray"):
+            scores = np.asarray(X @ self._coef_t, dtype=np.float32)
+        else:
+            scores = np.asarray(X, dtype=np.float32) @ self._coef_t
+        scores += self._intercept
+        return self._activate(scores)
+
+    def predict_proba_row(self, x) -> np.ndarray:
+        """
+        Une seule question : calcul dans le buffer du thread courant.
+        Le résultat est réutilisé au prochain appel du même thread.
+        """
+        if hasattr(x, "toarray"):
+            return self.predict_proba(x)[0]
+        buf = getattr(self._local, "buf", None)
+        if buf is None:
+            buf = self._local.buf = np.empty((1, self._coef_t.shape[1]), dtype=np.float32)
+        np.dot(np.asarray(x, dtype=np.float32).reshape(1, -1), self._coef_t, out=buf)
+        buf += self._intercept
+        return self._activate(buf)[0]
+
+    def _activate(self, scores: np.ndarray) -> np.ndarray:
+        if self._binary:
+            p1 = 1.0 / (1.0 + np.exp(-scores[:, 0]))
+            return np.column_stack([1.0 - p1, p1]).astype(np.float32, copy=False)
+        if self._ovr:
+            np.negative(scores, out=scores)
+            np.exp(scores, out=scores)
+            scores += 1.0
+            np.reciprocal(scores, out=scores)
+        else:
+            scores -= scores.max(axis=1, keepdims=True)
+            np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+
+
+def top_k(probs: np.ndarray, k: int = 3) -> tuple[np.ndarray, float]:
+    """Indices des k meilleures classes (décroissant) et marge top1 − top2."""
+    n = probs.shape[0]
+    k = max(1, min(k, n))
+    m = min(max(k, 2), n)
+    best = np.argpartition(probs, -m)[-m:] if m < n else np.arange(n)
+    best = best[np.argsort(probs[best])[::-1]]
+    margin = float(probs[best[0]] - probs[best[1]]) if n > 1 else float(probs[best[0]])
+    return best[:k], margin
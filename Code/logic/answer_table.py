@@ -0,0 +1,211 @@
+# logic/answer_table.py
+"""
+Table matérialisée des réponses des intentions sans paramètre.
+- pour chaque (intention, langue, mode brève/détaillée) la réponse finale
+  (traduite) est calculée une fois, en arrière-plan, puis servie par simple
+  lecture de dictionnaire ;
+- la table est immuable (MappingProxyType) et remplacée par swap atomique ;
+- les intentions adossées aux programmes sont recalculées quand le contenu
+  de l'instantané des programmes change (ProgrammeSnapshot.version) ; un
+  simple rechargement par TTL ne les invalide pas (cf. logic/programme_snapshot.py).
+"""
+
+import copy
+import os
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Optional
+
+from logic import programmes as P
+from logic.translator import track_translation
+
+MODES = ("breve", "detaille")
+# Délai avant de recalculer les entrées manquantes (traduction échouée ou partielle)
+ANSWER_TABLE_RETRY_S = float(os.getenv("ANSWER_TABLE_RETRY_S", "30"))
+_MODE_ALIASES = {"brief": "breve", "brève": "breve", "detailed": "detaille", "détaillé": "detaille"}
+
+
+@dataclass(frozen=True)
+class AnswerFamily:
+    intents: tuple                # noms d'intention servis (alias compris)
+    brief: Callable
+    detailed: Callable
+    data_backed: bool = False     # dépend de l'instantané des programmes
+    variants: tuple = ()          # mots-clés passés en 1er argument (ex. prix)
+
+
+FAMILIES = (
+    AnswerFamily(("get_event_hours_global", "get_event_hours_detailed"),
+                 P.get_event_hours_global, P.get_event_hours_detailed),
+    AnswerFamily(("get_event_locations_global", "get_event_locations_detailed"),
+                 P.get_event_locations_global, P.get_event_locations_detailed),
+    AnswerFamily(("get_editors_count_global", "get_editors_count_detailed"),
+                 P.get_editors_count_global, P.get_editors_count_detailed),
+    AnswerFamily(("get_event_price_global", "get_event_price_detailed"),
+                 P.get_event_price_global, P.get_event_price_detailed,
+                 variants=("concert", "atelier")),
+    AnswerFamily(("get_foire_start_date_global",),
+                 P.get_foire_start_date_global, P.get_foire_start_date_global),
+    AnswerFamily(("get_foire_end_date_global",),
+                 P.get_foire_end_date_global, P.get_foire_end_date_global),
+    AnswerFamily(("get_editors_countries_of_origin",),
+                 P.get_editors_countries_of_origin, P.get_editors_countries_of_origin),
+    AnswerFamily(("get_event_duration_detailed",),
+                 P.get_event_duration_detailed, P.get_event_duration_detailed),
+    AnswerFamily(("get_programme_28_avril", "programme_28_avril"),
+                 P.get_programme_28_avril, P.get_programme_28_avril),
+    AnswerFamily(("get_programme_04_mai", "programme_04_mai"),
+                 P.get_programme_04_mai, P.get_programme_04_mai),
+    AnswerFamily(("get_programme_07_mai", "programme_07_mai"),
+                 P.get_programme_07_mai, P.get_programme_07_mai),
+    # --- Adossées à l'instantané des programmes
+    AnswerFamily(("get_programme_date_range", "get_programme_date_range_detailed"),
+                 P.get_programme_date_range, P.get_programme_date_range_detailed, data_backed=True),
+    AnswerFamily(("get_programme_enfant_general_global", "get_programme_enfant_general_detailed"),
+                 P.get_programme_enfant_general_global, P.get_programme_enfant_general_detailed,
+                 data_backed=True),
+    AnswerFamily(("get_all_programme_combined_dates_global", "get_all_programmes_detailed"),
+                 P.get_all_programme_combined_dates_global, P.get_all_programmes_detailed,
+                 data_backed=True),
+    AnswerFamily(("get_programme_duration_global",),
+                 P.get_programme_duration_global, P.get_programme_duration_global, data_backed=True),
+)
+
+
+def snapshot_version(snap: Any) -> Any:
+    """Version du contenu de l'instantané (à défaut, son identité)."""
+    return getattr(snap, "version", None) or id(snap)
+
+
+def natural_mode(intent: str) -> str:
+    """Mode implicite d'une intention : « *_detailed » → détaillé."""
+    return "detaille" if intent.endswith("_detailed") else "breve"
+
+
+def normalize_mode(mode: Optional[str], intent: str) -> str:
+    mode = _MODE_ALIASES.get(mode, mode)
+    return mode if mode in MODES else natural_mode(intent)
+
+
+class AnswerTable:
+    def __init__(self, families=FAMILIES, langs=tuple(P.SUPPORTED_LANGS),
+                 snapshot: Callable[[], Any] = P.get_programmes_snapshot):
+        self._families = {intent: fam for fam in families for intent in fam.intents}
+        self._langs = langs
+        self._snapshot = snapshot
+        self._table = MappingProxyType({})
+        self._snap_ref = None          # version de l'instantané des entrées « données »
+        self._lock = threading.Lock()
+        self._complete = False         # toutes les entrées calculées et traduites
+        self._retry_at = 0.0
+        self._pid = os.getpid()
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    # -----------------------------------------------------------------
+    def lookup(self, intent: str, lang: str = "fr", mode: Optional[str] = None,
+               question: str = "") -> Optional[Any]:
+        """Réponse précalculée, ou None (l'appelant calcule alors en direct)."""
+        if self._pid != os.getpid():
+            # Worker forké pendant le calcul : le thread et son verrou ne suivent pas
+            self._pid = os.getpid()
+            self._lock = threading.Lock()
+            if not self._complete:
+                self.warm()
+        fam = self._families.get(intent)
+        if fam is None:
+            return None
+        if fam.data_backed:
+            try:
+                snap = self._snapshot()
+            except Exception:
+                return None
+            if snapshot_version(snap) != self._snap_ref:
+                self.warm()
+                return None
+        variant = self._variant(fam, question)
+        value = self._table.get((id(fam), lang, normalize_mode(mode, intent), variant))
+        if value is None and not self._complete and time.monotonic() >= self._retry_at:
+            self.warm()
+        # Copie : l'appelant peut enrichir la réponse (storytelling)
+        return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+    def warm(self, background: bool = True) -> None:
+        """(Re)calcule la table ; un seul calcul à la fois."""
+        if self._lock.locked():
+            return
+        if background:
+            threading.Thread(target=self._build, name="answer-table", daemon=True).start()
+        else:
+            self._build()
+
+    # -----------------------------------------------------------------
+    @staticmethod
+    def _variant(fam: AnswerFamily, question: str) -> Optional[str]:
+        q = (question or "").lower()
+        return next((v for v in fam.variants if v in q), None)
+
+    def _render(self, fam: AnswerFamily, mode: str, lang: str, variant: Optional[str]):
+        fn = fam.detailed if mode == "detaille" else fam.brief
+        if fam.variants:
+            return fn(variant, lang=lang)
+        return fn(lang=lang)
+
+    def _build(self) -> None:
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            try:
+                snap = self._snapshot()
+            except Exception as e:
+                print(f"[WARN] Table des réponses : programmes indisponibles ({e})")
+                snap = None
+            version = snapshot_version(snap) if snap is not None else None
+            refresh_data = snap is not None and version != self._snap_ref
+            families = {id(f): f for f in self._families.values()}.values()
+            data_ids = {id(f) for f in families if f.data_backed}
+            entries = {k: v for k, v in self._table.items()
+                       if not (refresh_data and k[0] in data_ids)}
+            skipped = 0
+
+            # Français d'abord (servi immédiatement), puis les traductions
+            for lang in sorted(self._langs, key=lambda l: l != "fr"):
+                for fam in families:
+                    if fam.data_backed and snap is None:
+                        continue
+                    for mode in MODES:
+                        for variant in (None,) + fam.variants:
+                            key = (id(fam), lang, mode, variant)
+                            if key in entries:
+                                continue
+                            try:
+                                with track_translation() as report:
+                                    value = self._render(fam, mode, lang, variant)
+                            except Exception as e:
+                                print(f"[WARN] Table des réponses : {fam.intents[0]}/{lang} ignoré ({e})")
+                                skipped += 1
+                                continue
+                            # Traduction en échec ou partielle (feuilles restées en français,
+                            # ex. lot hors délai) : non stockée, recalculée au prochain passage
+                            if lang != "fr" and (not report.complete
+                                                 or value == entries.get((id(fam), "fr", mode, variant))):
+                                skipped += 1
+                                continue
+                            entries[key] = value
+                if lang == "fr":
+                    self._table = MappingProxyType(dict(entries))
+                    if refresh_data:
+                        self._snap_ref = version
+            self._table = MappingProxyType(entries)
+            self._complete = skipped == 0 and snap is not None
+            self._retry_at = time.monotonic() + ANSWER_TABLE_RETRY_S
+            print(f"✅ Table des réponses prête ({len(entries)} entrées"
+                  f"{f', {skipped} à recalculer' if skipped else ''})")
+        finally:
+            self._lock.release()
+
+
+ANSWERS = AnswerTable()
@@ -0,0 +1,323 @@
+# logic/catalog.py
+"""
+Catalogue hors ligne des textes statiques des réponses (fr → en/de/ar/ja/zh).
+- extraction : analyse AST des modules de réponses, chaque chaîne française
+  littérale (hors docstrings, clés de dictionnaire, f-strings et logs) ;
+- amorçage avec les tables déjà traduites à la main (LABELS, I18N,
+  FAQ_RESPONSES : tout dictionnaire indexé par code de langue) ;
+- catalogue versionné dans i18n/messages.json (relu et committé, sans
+  numéros de ligne), puis compilé en un pickle {langue: {texte fr: traduction}} ;
+- consulté par translate_tree avant toute traduction automatique, qui ne
+  sert plus qu'au contenu dynamique (MongoDB) ; MESSAGE_CATALOG_ENABLED=0
+  le désactive ;
+- build et stats échouent (code 1) s'il manque une traduction.
+
+Usage :
+    python -m logic.catalog build [--translate]   # extraction (+ traduction des manquants)
+    python -m logic.catalog compile
+    python -m logic.catalog stats
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import pickle
+import sys
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Optional
+
+from logic.translator import SAFE_KEYS, SUPPORTED_LANGS
+
+CODE_DIR = Path(__file__).resolve().parent.parent
+CATALOG_PATH = Path(os.getenv("MESSAGE_CATALOG_PATH") or CODE_DIR / "i18n" / "messages.json")
+COMPILED_CATALOG_PATH = Path(os.getenv("COMPILED_CATALOG_PATH") or
+                             CODE_DIR / "local_data" / "messages.pickle")
+MESSAGE_CATALOG_ENABLED = os.getenv("MESSAGE_CATALOG_ENABLED", "1") == "1"
+
+CATALOG_SOURCES = (
+    "logic/programmes.py",
+    "logic/translator.py",
+    "chatbot_story.py",
+    "faq_retrieval.py",
+    "logic/fallback.py",
+)
+TARGET_LANGS = tuple(l for l in SUPPORTED_LANGS if l != "fr")
+
+# Appels dont les arguments ne sont jamais montrés au visiteur
+_SKIP_CALLS = {"print", "getenv", "get", "find", "find_one", "distinct", "strptime", "strftime",
+               "split", "join", "replace", "startswith", "endswith"}
+
+
+# ---------------------------------------------------------------------
+# Extraction
+# ---------------------------------------------------------------------
+def _is_lang_table(node: ast.AST) -> bool:
+    keys = getattr(node, "keys", None)
+    return (isinstance(node, ast.Dict) and len(keys) >= 2
+            and all(isinstance(k, ast.Constant) and k.value in SUPPORTED_LANGS for k in keys))
+
+
+def _is_message(text: str) -> bool:
+    # Phrase affichable : au moins deux mots et une lettre
+    return " " in text.strip() and any(c.isalpha() for c in text)
+
+
+class _Extractor(ast.NodeVisitor):
+    def __init__(self, relpath: str):
+        self.relpath = relpath
+        self.strings: dict[str, list[str]] = {}
+        self.seeds: dict[str, dict[str, str]] = {}
+        self._skip: set[int] = set()
+
+    def _add(self, text: str, node: ast.AST) -> None:
+        self.strings.setdefault(text, []).append(f"{self.relpath}:{node.lineno}")
+
+    def _seed(self, fr: str, table: ast.Dict, node: ast.AST) -> None:
+        entry = self.seeds.setdefault(fr, {})
+        for k, v in zip(table.keys, table.values):
+            if k.value != "fr" and isinstance(v, ast.Constant) and isinstance(v.value, str):
+                entry[k.value] = v.value
+        self._add(fr, node)
+
+    def _skip_subtree(self, node: ast.AST) -> None:
+        self._skip.update(id(n) for n in ast.walk(node))
+
+    def visit_Expr(self, node: ast.Expr):
+        # Docstrings et chaînes isolées
+        if isinstance(node.value, ast.Constant):
+            return
+        self.generic_visit(node)
+
+    def visit_Dict(self, node: ast.Dict):
+        if _is_lang_table(node):
+            fr = next((v for k, v in zip(node.keys, node.values) if k.value == "fr"), None)
+            if isinstance(fr, ast.Constant) and isinstance(fr.value, str):
+                self._seed(fr.value, node, fr)
+            self._skip_subtree(node)
+            return
+        for k, v in zip(node.keys, node.values):
+            if k is None:
+                continue
+            self._skip.add(id(k))
+            if isinstance(k, ast.Constant) and k.value in SAFE_KEYS:
+                self._skip_subtree(v)
+            # { "texte fr": {"en": ..., "de": ...} } (cf. LABELS)
+            elif (isinstance(k, ast.Constant) and isinstance(k.value, str) and _is_lang_table(v)
+                  and not any(lk.value == "fr" for lk in v.keys)):
+                self._seed(k.value, v, k)
+                self._skip_subtree(v)
+        self.generic_visit(node)
+
+    def visit_JoinedStr(self, node):
+        # Gabarits dynamiques : traduits à l'exécution
+        self._skip_subtree(node)
+
+    def visit_Call(self, node: ast.Call):
+        fn = node.func
+        name = fn.attr if isinstance(fn, ast.Attribute) else getattr(fn, "id", None)
+        if name in _SKIP_CALLS:
+            for arg in node.args:
+                self._skip_subtree(arg)
+        self.generic_visit(node)
+
+    def visit_Compare(self, node):
+        self._skip_subtree(node)
+
+    def visit_Subscript(self, node):
+        self._skip_subtree(node.slice)
+        self.generic_visit(node)
+
+    def visit_Constant(self, node: ast.Constant):
+        if id(node) in self._skip or not isinstance(node.value, str):
+            return
+        if _is_message(node.value):
+            self._add(node.value, node)
+
+
+def extract(sources: Iterable[str] = CATALOG_SOURCES, root: Path = CODE_DIR):
+    """({texte fr: [fichier:ligne]}, {texte fr: {langue: traduction manuelle}})."""
+    strings, seeds = {}, {}
+    for rel in sources:
+        path = root / rel
+        extractor = _Extractor(rel)
+        extractor.visit(ast.parse(path.read_text(encoding="utf-8"), filename=str(path)))
+        for text, where in extractor.strings.items():
+            strings.setdefault(text, []).extend(where)
+        for text, tr in extractor.seeds.items():
+            seeds.setdefault(text, {}).update(tr)
+    return strings, seeds
+
+
+# ---------------------------------------------------------------------
+# Catalogue versionné
+# ---------------------------------------------------------------------
+def _version(messages: dict) -> str:
+    payload = json.dumps(messages, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def read_catalog(path: Path = CATALOG_PATH) -> dict:
+    if not path.exists():
+        return {"version": None, "messages": {}}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def build_catalog(path: Path = CATALOG_PATH, translate: bool = False) -> dict:
+    """
+    Réextrait les sources et fusionne avec le catalogue existant.
+    Priorité : traductions manuelles > catalogue > cache des traductions
+    > backend (avec --translate). Les textes disparus des sources sont retirés.
+    """
+    from logic.translation_cache import TRANSLATIONS
+
+    strings, seeds = extract()
+    previous = read_catalog(path).get("messages", {})
+    messages = {fr: {**previous.get(fr, {}), **seeds.get(fr, {})} for fr in sorted(strings)}
+
+    for lang in TARGET_LANGS:
+        missing = [fr for fr, tr in messages.items() if lang not in tr]
+        for fr, text in TRANSLATIONS.get_many(missing, lang).items():
+            messages[fr][lang] = text
+        missing = [fr for fr in missing if lang not in messages[fr]]
+        if translate and missing:
+            from logic.translator import translate_missing
+            # Hors ligne : pas d'échéance serrée, seulement le disjoncteur
+            for fr, text in translate_missing(missing, lang, deadline=600).items():
+                messages[fr][lang] = text
+
+    messages = {fr: dict(sorted(tr.items())) for fr, tr in messages.items()}
+    catalog = {
+        "version": _version(messages),
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "langs": list(TARGET_LANGS),
+        "messages": messages,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(catalog, ensure_ascii=False, indent=1) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+    return catalog
+
+
+def _source_stamp(path: Path) -> str:
+    st = path.stat()
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+def missing_translations(catalog: Optional[dict] = None) -> dict[str, list[str]]:
+    """{langue: [textes fr sans traduction]} (vide si le catalogue est complet)."""
+    catalog = catalog if catalog is not None else read_catalog()
+    missing = {lang: [fr for fr, tr in catalog["messages"].items() if not tr.get(lang)]
+               for lang in TARGET_LANGS}
+    return {lang: texts for lang, texts in missing.items() if texts}
+
+
+def compile_catalog(path: Path = CATALOG_PATH, out: Path = COMPILED_CATALOG_PATH) -> dict:
+    """Catalogue JSON → pickle {langue: {texte fr: traduction}}."""
+    catalog = read_catalog(path)
+    tables = {lang: {} for lang in TARGET_LANGS}
+    for fr, tr in catalog["messages"].items():
+        for lang, text in tr.items():
+            tables.setdefault(lang, {})[fr] = text
+    compiled = {"version": catalog["version"], "stamp": _source_stamp(path), "tables": tables}
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, out)
+    return compiled
+
+
+# ---------------------------------------------------------------------
+# Lecture à l'exécution
+# ---------------------------------------------------------------------
+class MessageCatalog:
+    def __init__(self, path: Path = CATALOG_PATH, compiled: Path = COMPILED_CATALOG_PATH):
+        self._path = Path(path)
+        self._compiled = Path(compiled)
+        self._tables: Optional[dict] = None
+        self._lock = threading.Lock()
+        self.version: Optional[str] = None
+
+    def load(self) -> int:
+        """Charge le catalogue compilé (recompilé si le JSON a changé)."""
+        with self._lock:
+            if not self._path.exists():
+                self._tables, self.version = {}, None
+                return 0
+            data = None
+            if self._compiled.exists():
+                with open(self._compiled, "rb") as f:
+                    data = pickle.load(f)
+                if data.get("stamp") != _source_stamp(self._path):
+                    data = None
+            if data is None:
+                try:
+                    data = compile_catalog(self._path, self._compiled)
+                except OSError:
+                    # Répertoire en lecture seule : compilation en mémoire seulement
+                    data = {"version": None, "tables": {}}
+                    for fr, tr in read_catalog(self._path)["messages"].items():
+                        for lang, text in tr.items():
+                            data["tables"].setdefault(lang, {})[fr] = text
+            self._tables, self.version = data["tables"], data["version"]
+            return sum(len(t) for t in self._tables.values())
+
+    def _table(self, lang: str) -> dict:
+        if self._tables is None:
+            try:
+                self.load()
+            except Exception as e:
+                print(f"[WARN] Catalogue des messages indisponible : {e}")
+                self._tables = {}
+        return self._tables.get(lang, {})
+
+    def get(self, text: str, lang: str) -> Optional[str]:
+        return self._table(lang).get(text)
+
+    def lookup_many(self, texts: Iterable[str], lang: str) -> dict[str, str]:
+        table = self._table(lang)
+        return {t: table[t] for t in texts if t in table}
+
+    def coverage(self) -> dict[str, float]:
+        """Part des textes du catalogue traduits, par langue."""
+        catalog = read_catalog(self._path)
+        total = len(catalog["messages"]) or 1
+        return {lang: sum(1 for tr in catalog["messages"].values() if lang in tr) / total
+                for lang in TARGET_LANGS}
+
+
+CATALOG = MessageCatalog() if MESSAGE_CATALOG_ENABLED else None
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Catalogue des textes statiques traduits")
+    parser.add_argument("action", choices=["build", "compile", "stats"])
+    parser.add_argument("--translate", action="store_true",
+                        help="traduit les textes manquants avec le backend de traduction")
+    args = parser.parse_args(argv)
+
+    if args.action == "build":
+        catalog = build_catalog(translate=args.translate)
+        compile_catalog()
+        print(f"✅ Catalogue {catalog['version']} : {len(catalog['messages'])} textes → {CATALOG_PATH}")
+    elif args.action == "compile":
+        compiled = compile_catalog()
+        print(f"✅ Catalogue {compiled['version']} compilé → {COMPILED_CATALOG_PATH}")
+    catalog = read_catalog()
+    total = len(catalog["messages"])
+    missing = missing_translations(catalog)
+    for lang in TARGET_LANGS:
+        print(f"   {lang} : {total - len(missing.get(lang, []))}/{total} traduits")
+    if args.action in ("build", "stats") and missing:
+        for lang, texts in missing.items():
+            print(f"❌ {lang} : {len(texts)} texte(s) sans traduction, ex. {texts[0]!r}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
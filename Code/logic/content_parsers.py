@@ -0,0 +1,249 @@
+# logic/content_parsers.py
+"""
+Lecture des fichiers texte de « Contenu de la Base.zip » (source des
+collections MongoDB) en documents au format des collections :
+- Programmes Foire 2023.txt  → programmes_foire_2023
+- Programme Enfant 2023.txt  → programmes_enfant_2023
+- Editeurs Foire.txt         → editeurs_foire
+- Invités Speciales.txt      → invites_speciales
+"""
+
+import os
+import re
+import unicodedata
+import zipfile
+from pathlib import Path
+from typing import Optional
+
+from logic.dates import MOIS_FR, parse_date_fr
+from text_normalizer import fold
+
+CONTENT_ZIP = Path(os.getenv("LOCAL_CONTENT_ZIP") or
+                   Path(__file__).resolve().parents[2] / "Contenu de la Base.zip")
+
+# Fichier (nom replié, sans accents) → collection
+CONTENT_FILES = {
+    "programmes foire 2023.txt": "programmes_foire_2023",
+    "programme enfant 2023.txt": "programmes_enfant_2023",
+    "editeurs foire.txt": "editeurs_foire",
+    "invites speciales.txt": "invites_speciales",
+}
+
+_DAY_HEADER = re.compile(r"^\s*-{3,}\s*(.*?)\s*-{3,}\s*$")
+_SPACES = re.compile(r"\s+")
+_HOURS = re.compile(r"(\d{1,2}[:h]\d{2})(?:\s*(?:à|-|a)\s*(\d{1,2}[:h]\d{2}))?")
+
+
+def _clean(s: str) -> str:
+    return _SPACES.sub(" ", s or "").strip()
+
+
+def _day(header: str) -> Optional[tuple[str, str]]:
+    """« SAMEDI 29 AVRIL 2023 » → (« 29 Avril 2023 », « 2023-04-29 »)."""
+    try:
+        dt = parse_date_fr(header)
+    except ValueError:
+        return None
+    label = f"{dt.day:02d} {MOIS_FR[dt.month - 1].capitalize()} {dt.year}"
+    return label, dt.date().isoformat()
+
+
+def _hours(text: str) -> Optional[str]:
+    m = _HOURS.search(text or "")
+    if not m:
+        return None
+    start, end = m.group(1).replace("h", ":"), m.group(2)
+    return f"{start} à {end.replace('h', ':')}" if end else start
+
+
+def _split_names(text: str) -> list[str]:
+    parts = re.split(r"\s*,\s*|\s+et\s+", _clean(text))
+    return [p for p in parts if p]
+
+
+def _days(text: str):
+    """Découpe un fichier en (jour, lignes) selon les en-têtes « ---- date ---- »."""
+    current, lines = None, []
+    for line in text.splitlines():
+        m = _DAY_HEADER.match(line)
+        if m:
+            if current:
+                yield current, lines
+            current, lines = _day(m.group(1)), []
+            if current is None:
+                print(f"[WARN] En-tête de jour non reconnu : {line.strip()!r}")
+        elif current:
+            lines.append(line.rstrip())
+    if current:
+        yield current, lines
+
+
+def _blocks(lines: list[str]):
+    block = []
+    for line in lines:
+        if line.strip():
+            block.append(line)
+        elif block:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+# ---------------------------------------------------------------------
+# Programme adultes
+# ---------------------------------------------------------------------
+def parse_programmes_foire(text: str) -> list[dict]:
+    docs = []
+    for (label, iso), lines in _days(text):
+        for block in _blocks(lines):
+            doc = {"date": label, "date_iso": iso, "titre": _clean(block[0])}
+            description = []
+            for raw in block[1:]:
+                line = _clean(raw)
+                key = fold(line.split(":", 1)[0]).strip() if ":" in line else ""
+                value = _clean(line.split(":", 1)[1]) if ":" in line else line
+                low = fold(line)
+                if key.startswith("duree"):
+                    doc["heure"] = _hours(value) or value
+                elif key.startswith("directeur") or key.startswith("directrice"):
+                    doc["directeur"] = value
+                elif key.startswith("les invites"):
+                    doc["invites"] = _split_names(value)
+                elif key.startswith("adresse"):
+                    doc["salle"] = value
+                elif key.startswith("acces"):
+                    doc["Accés"] = value
+                elif low.startswith(("salle", "theatre", "maison de")) and "salle" not in doc:
+                    doc["salle"] = line
+                elif ("reservee" in low or "resevee" in low or "ouvert au public" in low) and len(line) < 40:
+                    doc["Accés"] = line
+                else:
+                    description.append(line)
+            if description:
+                doc["description"] = " ".join(description)
+            # Paragraphe isolé (suite de description) : rattaché à l'événement précédent
+            if len(doc) == 3 and docs and docs[-1]["date_iso"] == iso:
+                prev = docs[-1]
+                prev["description"] = _clean(f"{prev.get('description', '')} {doc['titre']}")
+                continue
+            docs.append(doc)
+    return docs
+
+
+# ---------------------------------------------------------------------
+# Programme enfants
+# ---------------------------------------------------------------------
+_ITEM = re.compile(r"^\s*\d+\s*[.)-]\s*(.*)$")
+
+
+def _strip_hours(text: str) -> str:
+    text = re.sub(r"[,:]?\s*(dur[ée]e\s*:?)?\s*\(?\d{1,2}[:h]\d{2}(\s*(à|-|a)\s*(\d{1,2}[:h]\d{2})?)?\)?\s*$",
+                  "", text, flags=re.IGNORECASE)
+    return _clean(text).rstrip(" :,")
+
+
+def parse_programme_enfant(text: str) -> list[dict]:
+    docs = []
+    for (label, iso), lines in _days(text):
+        salle, items, shared_hours = None, [], None
+
+        def flush():
+            for titre in items:
+                if not titre:
+                    continue
+                doc = {"date": label, "date_iso": iso, "titre": _strip_hours(titre) or titre,
+                       "salle": salle}
+                heure = _hours(titre) or shared_hours
+                if heure:
+                    doc["heure"] = heure
+                docs.append(doc)
+
+        for raw in lines:
+            if not raw.strip():
+                continue
+            indented = raw[:1].isspace()
+            line = _clean(raw)
+            if not indented and ":" in line and not fold(line).startswith("invite"):
+                flush()
+                head, rest = line.split(":", 1)
+                salle, items, shared_hours = _clean(head), [], None
+                line = _clean(rest)
+                if not line:
+                    continue
+            elif salle is None:
+                continue
+            m = _ITEM.match(line)
+            if m:
+                items.append(m.group(1))
+            elif fold(line).startswith("duree"):
+                shared_hours = _hours(line)
+            elif items:
+                items[-1] = f"{items[-1]} {line}"
+            else:
+                items.append(line)
+        flush()
+    return docs
+
+
+# ---------------------------------------------------------------------
+# Éditeurs et invités
+# ---------------------------------------------------------------------
+_EDITEUR = re.compile(r"^\s*(\d+)\s{2,}(\S.*?)\s{2,}(\S.*?)\s{2,}(\d+)\s*$")
+
+
+def parse_editeurs(text: str) -> list[dict]:
+    docs = []
+    for line in text.splitlines():
+        m = _EDITEUR.match(line)
+        if not m:
+            continue
+        pays, nom = _clean(m.group(2)), _clean(m.group(3))
+        docs.append({
+            "ordre": int(m.group(1)),
+            "pays": None if set(pays) <= {"*"} else pays,
+            "presenteur": None if set(nom) <= {"*"} else nom,
+            "rayon": int(m.group(4)),
+        })
+    return docs
+
+
+_GUEST = re.compile(r"^\s*(\d+)\s*[.)]\s*(\S.*)$")
+
+
+def parse_invites(text: str) -> list[dict]:
+    docs, current = [], None
+    for line in text.splitlines():
+        m = _GUEST.match(line)
+        if m:
+            current = {"numero": int(m.group(1)), "nom": _clean(m.group(2).strip("«» \"")), "description": ""}
+            docs.append(current)
+        elif current and line.strip():
+            current["description"] = _clean(f"{current['description']} {line}")
+    return docs
+
+
+PARSERS = {
+    "programmes_foire_2023": parse_programmes_foire,
+    "programmes_enfant_2023": parse_programme_enfant,
+    "editeurs_foire": parse_editeurs,
+    "invites_speciales": parse_invites,
+}
+
+
+def _collection_for(member: str) -> Optional[str]:
+    name = unicodedata.normalize("NFC", Path(member).name.replace("#U00e9", "é"))
+    return CONTENT_FILES.get(fold(name))
+
+
+def load_content(zip_path: str | Path = CONTENT_ZIP) -> dict[str, list[dict]]:
+    """Toutes les collections disponibles dans l'archive de contenu."""
+    collections = {}
+    with zipfile.ZipFile(zip_path) as zf:
+        for member in zf.namelist():
+            name = _collection_for(member)
+            if name is None:
+                continue
+            text = zf.read(member).decode("utf-8-sig")
+            collections[name] = PARSERS[name](text)
+    return collections
@@ -0,0 +1,142 @@
+# logic/database.py
+"""
+Accès MongoDB partagé par toute l'application.
+- UN client par processus, créé paresseusement au premier accès et recréé
+  après un fork (chaque worker gunicorn a son propre pool, rien n'est
+  ouvert avant le fork) ;
+- taille des pools et timeouts configurables par variables d'environnement ;
+- poignées de collections paresseuses qui appliquent toujours une
+  projection par défaut aux lectures (find / find_one) ;
+- DATA_BACKEND=local (ou MONGO_URI absent) : mêmes poignées servies par la
+  base SQLite construite depuis « Contenu de la Base.zip »
+  (cf. logic/local_store.py), en lecture seule : les écritures lèvent
+  ReadOnlyBackendError (503 côté API).
+"""
+
+import os
+import threading
+from typing import Any, Mapping, Optional
+
+from dotenv import load_dotenv
+from pymongo import MongoClient
+from pymongo.collection import Collection
+from pymongo.database import Database
+
+load_dotenv()
+MONGO_URI = os.getenv("MONGO_URI")
+MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "chatbotEvent")
+# "mongo" | "local" — sans MONGO_URI, l'application démarre sur le backend local
+DATA_BACKEND = (os.getenv("DATA_BACKEND") or ("mongo" if MONGO_URI else "local")).strip().lower()
+if DATA_BACKEND == "local":
+    print("ℹ️ Backend de données local (SQLite, lecture seule)"
+          + ("" if os.getenv("DATA_BACKEND") else " : MONGO_URI absent"))
+
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "20"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "20000"))
+
+# Projections par défaut : seuls les champs lus par l'application
+PROGRAMME_PROJECTION = {"_id": 0, "date": 1, "date_iso": 1, "heure": 1, "titre": 1, "salle": 1,
+                        "directeur": 1, "Accés": 1, "invites": 1, "lieu": 1}
+COLLECTION_PROJECTIONS: dict[str, Optional[dict]] = {
+    "programmes_foire_2023": PROGRAMME_PROJECTION,
+    "programmes_enfant_2023": PROGRAMME_PROJECTION,
+    "editeurs_foire": {"_id": 0},
+    "comptes": {"username": 1, "mot_de_passe": 1, "type_compte": 1},
+    # Fiches enfants renvoyées telles quelles au front-end
+    "child_tracking": None,
+    "infos_generales": {"_id": 0},
+}
+
+class ReadOnlyBackendError(RuntimeError):
+    """Écriture demandée alors que le backend local (lecture seule) est actif."""
+
+
+_client: Optional[MongoClient] = None
+_client_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+def get_client() -> MongoClient:
+    """Client du processus courant (recréé dans un worker forké)."""
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is None or _client_pid != pid:
+        with _lock:
+            if _client is None or _client_pid != pid:
+                # Le client hérité du parent n'est pas fermé : ses sockets
+                # appartiennent au processus parent.
+                _client = MongoClient(
+                    MONGO_URI or "mongodb://localhost:27017/",
+                    maxPoolSize=MONGO_MAX_POOL_SIZE,
+                    minPoolSize=MONGO_MIN_POOL_SIZE,
+                    maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+                    serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                    connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+                    socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+                    connect=False,
+                )
+                _client_pid = pid
+    return _client
+
+
+def is_local() -> bool:
+    return DATA_BACKEND == "local"
+
+
+def get_db(name: Optional[str] = None) -> Database:
+    if is_local():
+        from logic.local_store import LocalDatabase, get_store
+        return LocalDatabase(get_store(), name or MONGO_DB_NAME)
+    return get_client()[name or MONGO_DB_NAME]
+
+
+def ping() -> bool:
+    """Vérifie la connexion (à appeler explicitement, jamais à l'import)."""
+    if is_local():
+        return True
+    get_client().admin.command("ping")
+    return True
+
+
+class CollectionHandle:
+    """
+    Poignée paresseuse vers une collection : résolue à chaque appel sur le
+    client du processus courant. find / find_one appliquent la projection
+    par défaut quand l'appelant n'en fournit pas ; les autres méthodes
+    (insert_one, aggregate, distinct…) sont celles de pymongo.
+    """
+
+    def __init__(self, name: str, projection: Optional[Mapping[str, Any]] = None,
+                 db_name: Optional[str] = None):
+        self.name = name
+        self.projection = dict(projection) if projection is not None else None
+        self._db_name = db_name
+
+    @property
+    def collection(self) -> Collection:
+        return get_db(self._db_name)[self.name]
+
+    def find(self, filter=None, projection=None, *args, **kwargs):
+        if projection is None:
+            projection = self.projection
+        return self.collection.find(filter or {}, projection, *args, **kwargs)
+
+    def find_one(self, filter=None, projection=None, *args, **kwargs):
+        if projection is None:
+            projection = self.projection
+        return self.collection.find_one(filter or {}, projection, *args, **kwargs)
+
+    def __getattr__(self, attr):
+        return getattr(self.collection, attr)
+
+    def __repr__(self) -> str:
+        return f"CollectionHandle({self._db_name or MONGO_DB_NAME}.{self.name})"
+
+
+def collection(name: str, db_name: Optional[str] = None) -> CollectionHandle:
+    """Poignée avec la projection par défaut déclarée pour cette collection."""
+    return CollectionHandle(name, COLLECTION_PROJECTIONS.get(name), db_name)
@@ -0,0 +1,62 @@
+# logic/dates.py
+"""
+Dates des programmes, indépendantes de la locale du serveur.
+- parse_date_fr : « 28 Avril 2023 », « samedi 29 avril 2023 », « 1er mai 2023 »,
+  « 28 April 2023 » → datetime (table de mémoïsation) ;
+- format_date_fr : datetime → « 28 avril » / « 28 avril 2023 » ;
+- to_iso : date canonique « 2023-04-28 », stockée dans le champ date_iso
+  des documents (tri et requêtes par plage sans analyse).
+"""
+
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+
+from text_normalizer import fold
+
+MOIS_FR = ("janvier", "février", "mars", "avril", "mai", "juin", "juillet",
+           "août", "septembre", "octobre", "novembre", "décembre")
+MOIS_EN = ("january", "february", "march", "april", "may", "june", "july",
+           "august", "september", "october", "november", "december")
+
+# Nom de mois replié (sans accents) → numéro ; abréviations usuelles incluses
+_MOIS = {}
+for _i, (_fr, _en) in enumerate(zip(MOIS_FR, MOIS_EN), start=1):
+    _MOIS[fold(_fr)] = _MOIS[_en] = _MOIS[_en[:3]] = _i
+_MOIS.update({"janv": 1, "fevr": 2, "avr": 4, "juil": 7, "sept": 9})
+
+_JOUR_MOIS_AN = re.compile(r"(\d{1,2})(?:er)?\s+([a-z]+)\.?\s+(\d{4})")
+_MOIS_JOUR_AN = re.compile(r"([a-z]+)\.?\s+(\d{1,2}),?\s+(\d{4})")
+
+
+@lru_cache(maxsize=256)
+def parse_date_fr(date_str: str) -> datetime:
+    text = fold(str(date_str or "")).strip()
+    m = _JOUR_MOIS_AN.search(text)
+    if m:
+        jour, mois, an = m.group(1), m.group(2), m.group(3)
+    else:
+        m = _MOIS_JOUR_AN.search(text)
+        if not m:
+            raise ValueError(f"Erreur lors de l’analyse des dates : format inconnu ({date_str!r})")
+        mois, jour, an = m.group(1), m.group(2), m.group(3)
+    if mois not in _MOIS:
+        raise ValueError(f"Erreur lors de l’analyse des dates : mois inconnu ({date_str!r})")
+    try:
+        return datetime(int(an), _MOIS[mois], int(jour))
+    except ValueError as e:
+        raise ValueError(f"Erreur lors de l’analyse des dates : {e}")
+
+
+def to_iso(date_str: str) -> Optional[str]:
+    """Date canonique ISO, ou None si la date n'est pas reconnue."""
+    try:
+        return parse_date_fr(date_str).date().isoformat()
+    except ValueError:
+        return None
+
+
+def format_date_fr(dt: datetime, year: bool = False) -> str:
+    text = f"{dt.day:02d} {MOIS_FR[dt.month - 1]}"
+    return f"{text} {dt.year}" if year else text
@@ -1,15 +1,8 @@
 # logic/editeurs.py
 
-from pymongo import MongoClient
-from dotenv import load_dotenv
-import os
+from logic.database import collection
 
-load_dotenv()
-MONGO_URI = os.getenv("MONGO_URI")
-
-client = MongoClient(MONGO_URI)
-db = client["chatbotEvent"]
-editeurs_collection = db["editeurs_foire"]
+editeurs_collection = collection("editeurs_foire")
 
 def get_publishers_info():
     return list(editeurs_collection.find({}, {"_id": 0}))
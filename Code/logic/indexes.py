@@ -0,0 +1,168 @@
+# logic/indexes.py
+"""
+Index MongoDB requis par les requêtes de l'application.
+- ensure_indexes() : création idempotente, en étape de migration avant le
+  déploiement (au démarrage des workers seulement si MONGO_ENSURE_INDEXES=1) ;
+- check_query_plans() : explain() de chaque requête filtrée émise par
+  l'application, signale tout COLLSCAN (mode test : MONGO_ASSERT_QUERY_PLANS=1) ;
+  les lectures intégrales voulues sont listées dans EXPECTED_FULL_SCANS.
+
+Usage :
+    python -m logic.indexes ensure
+    python -m logic.indexes check
+    python -m logic.indexes backfill   # champ date_iso des programmes
+"""
+
+import os
+import sys
+
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel, UpdateOne
+from pymongo.errors import OperationFailure, PyMongoError
+
+from logic.database import get_db, is_local
+from logic.dates import to_iso
+
+MONGO_ENSURE_INDEXES = os.getenv("MONGO_ENSURE_INDEXES", "0") == "1"
+MONGO_ASSERT_QUERY_PLANS = os.getenv("MONGO_ASSERT_QUERY_PLANS", "0") == "1"
+
+# Collection → index déclarés. Les programmes sont lus en entier (cf.
+# EXPECTED_FULL_SCANS) et child_tracking n'est interrogée que par _id.
+REQUIRED_INDEXES = {
+    "comptes": [IndexModel([("username", ASCENDING)], name="username_1", unique=True)],
+}
+
+# Requêtes filtrées émises par l'application (forme de la commande explain),
+# une par appel dans app.py
+_SAMPLE_ID = ObjectId("0" * 24)
+QUERY_PLANS = [
+    # /api/register, /api/login
+    ("compte par identifiant", {"find": "comptes", "filter": {"username": "exemple"}, "limit": 1}),
+    # /api/is-auth, /api/edit_account
+    ("compte par _id", {"find": "comptes", "filter": {"_id": _SAMPLE_ID}, "limit": 1}),
+    ("mise à jour de compte", {"update": "comptes",
+                               "updates": [{"q": {"_id": _SAMPLE_ID}, "u": {"$set": {"username": "x"}}}]}),
+    # /api/delete_account
+    ("suppression de compte", {"delete": "comptes", "deletes": [{"q": {"username": "exemple"}, "limit": 1}]}),
+    # /api/child/update|delete/<id>, /api/child/<id>/location|position
+    ("fiche enfant", {"find": "child_tracking", "filter": {"_id": _SAMPLE_ID}, "limit": 1}),
+    ("mise à jour enfant", {"update": "child_tracking",
+                            "updates": [{"q": {"_id": _SAMPLE_ID},
+                                         "u": {"$set": {"latitude": 0, "longitude": 0}}}]}),
+    ("suppression enfant", {"delete": "child_tracking",
+                            "deletes": [{"q": {"_id": _SAMPLE_ID}, "limit": 1}]}),
+]
+
+# Lectures intégrales, volontaires (collections de quelques centaines de
+# documents, chargées une fois puis servies depuis la mémoire) : non vérifiées
+EXPECTED_FULL_SCANS = [
+    ("programmes adultes + enfants", "logic/programmes.py iter_programme_days() : "
+                                     "aggregate $project → $unionWith → $group par date"),
+    ("éditeurs", "logic/editeurs.py : find({})"),
+    ("invités spéciaux", "logic/guests.py : find({}, {invites: 1})"),
+    ("liste des enfants", "app.py /api/child/all : find()"),
+]
+
+
+def ensure_indexes(db=None) -> dict:
+    """Crée les index manquants ; renvoie {collection: [noms]}."""
+    db = db if db is not None else get_db()
+    created = {}
+    for name, indexes in REQUIRED_INDEXES.items():
+        try:
+            created[name] = db[name].create_indexes(indexes)
+        except OperationFailure as e:
+            # Ex. doublons existants pour un index unique : on continue
+            print(f"[WARN] Index non créés sur {name} : {e}")
+    print(f"✅ Index MongoDB vérifiés ({sum(len(v) for v in created.values())})")
+    return created
+
+
+def backfill_date_iso(db=None, batch_size: int = 500) -> int:
+    """Ajoute date_iso aux documents de programme qui ne l'ont pas encore."""
+    db = db if db is not None else get_db()
+    total = 0
+    for name in ("programmes_foire_2023", "programmes_enfant_2023"):
+        ops = []
+        for doc in db[name].find({"date": {"$type": "string"}, "date_iso": {"$exists": False}}, {"date": 1}):
+            iso = to_iso(doc["date"])
+            if iso is None:
+                print(f"[WARN] {name} : date non reconnue {doc['date']!r}")
+                continue
+            ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"date_iso": iso}}))
+            if len(ops) >= batch_size:
+                total += db[name].bulk_write(ops, ordered=False).modified_count
+                ops = []
+        if ops:
+            total += db[name].bulk_write(ops, ordered=False).modified_count
+    print(f"✅ date_iso ajouté à {total} document(s)")
+    return total
+
+
+def _stages(plan: dict):
+    """Parcourt récursivement un plan d'exécution (inputStage / inputStages / queryPlan)."""
+    if not isinstance(plan, dict):
+        return
+    if "stage" in plan:
+        yield plan["stage"]
+    for key in ("inputStage", "queryPlan", "winningPlan"):
+        yield from _stages(plan.get(key))
+    for sub in plan.get("inputStages", []) or []:
+        yield from _stages(sub)
+
+
+def check_query_plans(db=None) -> list[str]:
+    """Liste des requêtes dont le plan gagnant contient un COLLSCAN."""
+    db = db if db is not None else get_db()
+    violations = []
+    for label, command in QUERY_PLANS:
+        explain = db.command("explain", command, verbosity="queryPlanner")
+        stages = list(_stages(explain.get("queryPlanner", {}).get("winningPlan", {})))
+        if "COLLSCAN" in stages:
+            violations.append(f"{label} ({next(iter(command.values()))}) : {' → '.join(stages)}")
+    return violations
+
+
+def assert_no_collscan(db=None) -> None:
+    violations = check_query_plans(db)
+    if violations:
+        raise AssertionError("COLLSCAN détecté :\n- " + "\n- ".join(violations))
+    print(f"✅ Plans de requêtes vérifiés ({len(QUERY_PLANS)} requêtes, aucun COLLSCAN ; "
+          f"lectures intégrales attendues : {', '.join(label for label, _ in EXPECTED_FULL_SCANS)})")
+
+
+def provision_at_startup() -> None:
+    """
+    Appelé par app.py, dans chaque worker : ne fait rien par défaut (pas de
+    connexion MongoDB à l'import). Opt-in : MONGO_ENSURE_INDEXES=1 et/ou
+    MONGO_ASSERT_QUERY_PLANS=1 ; sinon `python -m logic.indexes ensure`.
+    """
+    if not (MONGO_ENSURE_INDEXES or MONGO_ASSERT_QUERY_PLANS):
+        return
+    if is_local():
+        print("ℹ️ Backend local : index SQLite intégrés, provisionnement MongoDB ignoré")
+        return
+    if MONGO_ENSURE_INDEXES:
+        try:
+            ensure_indexes()
+        except PyMongoError as e:
+            print(f"⚠️ Provisionnement des index impossible : {e}")
+    if MONGO_ASSERT_QUERY_PLANS:
+        assert_no_collscan()
+
+
+if __name__ == "__main__":
+    action = sys.argv[1] if len(sys.argv) > 1 else "ensure"
+    if action == "ensure":
+        ensure_indexes()
+    elif action == "backfill":
+        backfill_date_iso()
+    elif action == "check":
+        try:
+            assert_no_collscan()
+        except AssertionError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+    else:
+        print("Usage : python -m logic.indexes [ensure|check|backfill]")
+        sys.exit(2)
@@ -0,0 +1,162 @@
+# logic/ingest.py
+"""
+Ingestion en masse de « Contenu de la Base.zip » dans MongoDB.
+- documents normalisés (date canonique + date_iso, public, clé déterministe) ;
+- upserts bulk_write par lots (ordonnés ou non) : ré-ingérer est idempotent ;
+- les documents dont la clé n'apparaît plus dans l'archive (titre, heure…
+  modifiés ou entrée retirée) sont supprimés après les upserts ;
+- rapport de débit (documents/s) et de latence par lot.
+
+Usage :
+    python -m logic.ingest                       # tout le contenu
+    python -m logic.ingest --batch-size 1000 --ordered
+    python -m logic.ingest --only editeurs_foire --dry-run
+    python -m logic.ingest --purge-unkeyed       # 1re fois : retire les documents saisis à la main
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from pymongo import ASCENDING, IndexModel, UpdateOne
+
+from logic.content_parsers import CONTENT_ZIP, load_content
+from logic.database import get_db, is_local
+
+INGEST_KEY = "_key"
+DEFAULT_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "500"))
+
+AUDIENCES = {
+    "programmes_foire_2023": "adulte",
+    "programmes_enfant_2023": "enfant",
+}
+
+# Champs qui identifient un document d'une édition à l'autre
+KEY_FIELDS = {
+    "programmes_foire_2023": ("date_iso", "heure", "titre"),
+    "programmes_enfant_2023": ("date_iso", "salle", "titre"),
+    "editeurs_foire": ("pays", "presenteur", "rayon"),
+    "invites_speciales": ("nom",),
+}
+
+
+def document_key(collection: str, doc: dict) -> str:
+    fields = KEY_FIELDS.get(collection) or tuple(sorted(doc))
+    payload = json.dumps([collection] + [doc.get(f) for f in fields], ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def normalize(collection: str, doc: dict) -> dict:
+    doc = dict(doc)
+    if collection in AUDIENCES:
+        doc["audience"] = AUDIENCES[collection]
+    doc[INGEST_KEY] = document_key(collection, doc)
+    return doc
+
+
+def _unique(name: str, docs: Iterable[dict], seen: set) -> Iterator[dict]:
+    """Documents normalisés ; une clé répétée écraserait silencieusement un document."""
+    for doc in docs:
+        doc = normalize(name, doc)
+        if doc[INGEST_KEY] in seen:
+            print(f"[WARN] {name} : doublon ignoré ({doc.get('titre') or doc.get('nom') or doc})")
+            continue
+        seen.add(doc[INGEST_KEY])
+        yield doc
+
+
+def _batches(ops: Iterable, size: int) -> Iterator[list]:
+    batch = []
+    for op in ops:
+        batch.append(op)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ingest_collection(db, name: str, docs: Iterable[dict], batch_size: int = DEFAULT_BATCH_SIZE,
+                      ordered: bool = False, dry_run: bool = False, purge_unkeyed: bool = False) -> dict:
+    coll = None if dry_run else db[name]
+    if not dry_run:
+        coll.create_indexes([IndexModel([(INGEST_KEY, ASCENDING)], name="ingest_key", unique=True)])
+        if purge_unkeyed:
+            removed = coll.delete_many({INGEST_KEY: {"$exists": False}}).deleted_count
+            print(f"🧹 {name} : {removed} document(s) sans clé d'ingestion supprimé(s)")
+
+    stats = {"documents": 0, "upserted": 0, "modified": 0, "deleted": 0, "batches": 0, "latencies_ms": []}
+    keys = set()
+    ops = (UpdateOne({INGEST_KEY: d[INGEST_KEY]}, {"$set": d}, upsert=True)
+           for d in _unique(name, docs, keys))
+    start = time.perf_counter()
+    for batch in _batches(ops, batch_size):
+        t0 = time.perf_counter()
+        if not dry_run:
+            result = coll.bulk_write(batch, ordered=ordered)
+            stats["upserted"] += result.upserted_count
+            stats["modified"] += result.modified_count
+        elapsed = (time.perf_counter() - t0) * 1000
+        stats["batches"] += 1
+        stats["documents"] += len(batch)
+        stats["latencies_ms"].append(elapsed)
+        print(f"   lot {stats['batches']:>3} : {len(batch):>5} docs en {elapsed:7.1f} ms")
+
+    # Clés absentes de cette ingestion : anciennes versions d'un document édité
+    if not dry_run:
+        if keys:
+            stats["deleted"] = coll.delete_many(
+                {INGEST_KEY: {"$exists": True, "$nin": sorted(keys)}}).deleted_count
+        else:
+            print(f"[WARN] {name} : aucun document analysé, suppression des anciennes clés ignorée")
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def ingest(zip_path: str | Path = CONTENT_ZIP, only: Iterable[str] | None = None,
+           batch_size: int = DEFAULT_BATCH_SIZE, ordered: bool = False,
+           dry_run: bool = False, purge_unkeyed: bool = False) -> dict:
+    if is_local() and not dry_run:
+        raise RuntimeError("DATA_BACKEND=local : l'ingestion écrit dans MongoDB (définir MONGO_URI)")
+    t0 = time.perf_counter()
+    content = load_content(zip_path)
+    parse_s = time.perf_counter() - t0
+    print(f"📦 Archive analysée en {parse_s * 1000:.0f} ms : "
+          + ", ".join(f"{k}={len(v)}" for k, v in content.items()))
+
+    db = None if dry_run else get_db()
+    report = {}
+    for name, docs in content.items():
+        if only and name not in only:
+            continue
+        print(f"➡️ {name}{' (simulation)' if dry_run else ''}")
+        stats = ingest_collection(db, name, docs, batch_size, ordered, dry_run, purge_unkeyed)
+        lat = sorted(stats.pop("latencies_ms")) or [0.0]
+        rate = stats["documents"] / stats["seconds"] if stats["seconds"] else 0.0
+        print(f"✅ {name} : {stats['documents']} docs, {stats['upserted']} insérés, "
+              f"{stats['modified']} modifiés, {stats['deleted']} supprimés — {rate:,.0f} docs/s, "
+              f"lot p50={lat[len(lat) // 2]:.1f} ms / max={lat[-1]:.1f} ms")
+        report[name] = {**stats, "docs_per_s": rate, "batch_p50_ms": lat[len(lat) // 2],
+                        "batch_max_ms": lat[-1]}
+    return report
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Ingestion de « Contenu de la Base.zip » dans MongoDB")
+    parser.add_argument("--zip", default=str(CONTENT_ZIP), help="archive de contenu")
+    parser.add_argument("--only", nargs="*", help="collections à ingérer (défaut : toutes)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--ordered", action="store_true", help="bulk_write ordonné (arrêt à la 1re erreur)")
+    parser.add_argument("--dry-run", action="store_true", help="analyse et mesure sans écrire")
+    parser.add_argument("--purge-unkeyed", action="store_true",
+                        help="supprime les documents sans clé d'ingestion (chargements manuels)")
+    args = parser.parse_args(argv)
+    ingest(args.zip, args.only, args.batch_size, args.ordered, args.dry_run, args.purge_unkeyed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+# logic/local_store.py
+"""
+Backend de données local (SQLite) pour fonctionner sans MongoDB :
+bornes hors ligne, CI, démarrage sans cluster.
+- la base est construite à partir de « Contenu de la Base.zip »
+  (cf. logic/content_parsers.py), reconstruite si l'archive change ;
+- LocalCollection expose la surface de requêtes utilisée par
+  logic/programmes.py, logic/guests.py et logic/editeurs.py :
+  find / find_one / distinct / count_documents / aggregate
+  ($match, $project, $unionWith, $group, $sort, $limit) ;
+- lecture seule : les écritures lèvent ReadOnlyBackendError
+  (renvoyée en 503 par /api).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from logic.content_parsers import CONTENT_ZIP, load_content
+from logic.database import ReadOnlyBackendError
+
+SCHEMA_VERSION = "1"
+LOCAL_STORE_PATH = Path(os.getenv("LOCAL_STORE_PATH") or
+                        Path(__file__).resolve().parent.parent / "local_data" / "contenu.sqlite")
+
+
+# ---------------------------------------------------------------------
+# Construction de la base
+# ---------------------------------------------------------------------
+def _source_version(zip_path: Path) -> str:
+    st = zip_path.stat()
+    return f"{SCHEMA_VERSION}:{st.st_mtime_ns}:{st.st_size}"
+
+
+def build_store(db_path: Path = LOCAL_STORE_PATH, zip_path: Path = CONTENT_ZIP,
+                collections: Optional[dict[str, list[dict]]] = None) -> Path:
+    """Écrit la base SQLite (fichier temporaire puis remplacement atomique)."""
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    if collections is None:
+        collections = load_content(zip_path)
+    tmp = db_path.with_name(db_path.name + ".tmp")
+    if tmp.exists():
+        tmp.unlink()
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.executescript("""
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE documents (
+                coll TEXT NOT NULL, seq INTEGER NOT NULL,
+                date TEXT, date_iso TEXT, body TEXT NOT NULL,
+                PRIMARY KEY (coll, seq)
+            );
+            CREATE INDEX documents_date ON documents (coll, date);
+            CREATE INDEX documents_date_iso ON documents (coll, date_iso);
+        """)
+        for name, docs in collections.items():
+            conn.executemany(
+                "INSERT INTO documents VALUES (?, ?, ?, ?, ?)",
+                ((name, i, d.get("date"), d.get("date_iso"), json.dumps(d, ensure_ascii=False))
+                 for i, d in enumerate(docs, start=1)),
+            )
+        conn.execute("INSERT INTO meta VALUES ('source', ?)", (_source_version(Path(zip_path)),))
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp, db_path)
+    n = sum(len(v) for v in collections.values())
+    print(f"✅ Base locale construite : {db_path} ({n} documents)")
+    return db_path
+
+
+def _is_current(db_path: Path, zip_path: Path) -> bool:
+    if not db_path.exists():
+        return False
+    if not zip_path.exists():
+        return True            # archive absente (image de déploiement) : on garde la base
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return False
+    return bool(row) and row[0] == _source_version(zip_path)
+
+
+# ---------------------------------------------------------------------
+# Filtres / projections (sous-ensemble MongoDB)
+# ---------------------------------------------------------------------
+_MISSING = object()
+
+
+def _get(doc: dict, path: str):
+    value = doc
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _compare(value, op: str, arg) -> bool:
+    if op == "$exists":
+        return (value is not _MISSING) == bool(arg)
+    if op == "$type":
+        return arg == "string" and isinstance(value, str)
+    values = value if isinstance(value, list) else [value]
+    if op == "$eq":
+        return any(v == arg for v in values)
+    if op == "$ne":
+        return all(v != arg for v in values)
+    if op == "$in":
+        return any(v in arg for v in values)
+    if op == "$nin":
+        return all(v not in arg for v in values)
+    checks = {"$gt": lambda v: v > arg, "$gte": lambda v: v >= arg,
+              "$lt": lambda v: v < arg, "$lte": lambda v: v <= arg}
+    if op in checks:
+        return any(v is not _MISSING and v is not None and type(v) is type(arg) and checks[op](v)
+                   for v in values)
+    raise NotImplementedError(f"Opérateur non supporté par le backend local : {op}")
+
+
+def matches(doc: dict, flt: Optional[dict]) -> bool:
+    for key, cond in (flt or {}).items():
+        if key == "$and":
+            if not all(matches(doc, f) for f in cond):
+                return False
+        elif key == "$or":
+            if not any(matches(doc, f) for f in cond):
+                return False
+        elif isinstance(cond, dict) and cond and all(k.startswith("$") for k in cond):
+            value = _get(doc, key)
+            if not all(_compare(value, op, arg) for op, arg in cond.items()):
+                return False
+        elif not _compare(_get(doc, key), "$eq", cond):
+            return False
+    return True
+
+
+def _eval(expr, doc: dict):
+    if isinstance(expr, str) and expr.startswith("$$ROOT"):
+        return dict(doc)
+    if isinstance(expr, str) and expr.startswith("$"):
+        value = _get(doc, expr[1:])
+        return None if value is _MISSING else value
+    if isinstance(expr, dict) and "$literal" in expr:
+        return expr["$literal"]
+    if isinstance(expr, dict) and "$ifNull" in expr:
+        return next((v for v in (_eval(e, doc) for e in expr["$ifNull"]) if v is not None), None)
+    return expr
+
+
+def project(doc: dict, projection: Optional[dict]) -> dict:
+    if not projection:
+        return dict(doc)
+    spec = dict(projection)
+    keep_id = spec.pop("_id", 1)
+    inclusion = {k: v for k, v in spec.items() if v not in (0, False)}
+    if inclusion:
+        out = {}
+        if keep_id and "_id" in doc:
+            out["_id"] = doc["_id"]
+        for key, value in inclusion.items():
+            if value in (1, True):
+                if key in doc:
+                    out[key] = doc[key]
+            else:
+                out[key] = _eval(value, doc)
+        return out
+    out = {k: v for k, v in doc.items() if spec.get(k, 1) not in (0, False)}
+    if not keep_id:
+        out.pop("_id", None)
+    return out
+
+
+# ---------------------------------------------------------------------
+# Curseurs et collections
+# ---------------------------------------------------------------------
+class LocalCursor(list):
+    """Liste de documents utilisable comme curseur pymongo (itération, with, sort, limit)."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def sort(self, key, direction: int = 1):
+        keys = key if isinstance(key, list) else [(key, direction)]
+        for field, order in reversed(keys):
+            super().sort(key=lambda d: (d.get(field) is None, d.get(field) or ""), reverse=order < 0)
+        return self
+
+    def limit(self, n: int):
+        if n:
+            del self[n:]
+        return self
+
+    def close(self):
+        pass
+
+
+class LocalCollection:
+    def __init__(self, store: "LocalStore", name: str):
+        self._store = store
+        self.name = name
+
+    def _scan(self, flt: Optional[dict]) -> Iterable[dict]:
+        sql, args = "SELECT seq, body FROM documents WHERE coll = ?", [self.name]
+        # Égalités sur les colonnes indexées : filtrées par SQLite
+        for column in ("date", "date_iso"):
+            value = (flt or {}).get(column)
+            if isinstance(value, str):
+                sql += f" AND {column} = ?"
+                args.append(value)
+        for seq, body in self._store.execute(sql + " ORDER BY seq", args):
+            doc = json.loads(body)
+            doc["_id"] = seq
+            if matches(doc, flt):
+                yield doc
+
+    def find(self, filter=None, projection=None, *args, sort=None, limit=0, **kwargs) -> LocalCursor:
+        cursor = LocalCursor(project(d, projection) for d in self._scan(filter))
+        if sort:
+            cursor.sort(list(sort.items()) if isinstance(sort, dict) else sort)
+        return cursor.limit(limit)
+
+    def find_one(self, filter=None, projection=None, *args, **kwargs) -> Optional[dict]:
+        return next((project(d, projection) for d in self._scan(filter)), None)
+
+    def count_documents(self, filter=None, **kwargs) -> int:
+        return sum(1 for _ in self._scan(filter))
+
+    def distinct(self, key: str, filter=None) -> list:
+        seen = []
+        for doc in self._scan(filter):
+            value = _get(doc, key)
+            for v in (value if isinstance(value, list) else [value]):
+                if v is not _MISSING and v not in seen:
+                    seen.append(v)
+        return seen
+
+    def aggregate(self, pipeline: list, **kwargs) -> LocalCursor:
+        docs = list(self._scan(None))
+        for stage in pipeline:
+            (op, arg), = stage.items()
+            if op == "$match":
+                docs = [d for d in docs if matches(d, arg)]
+            elif op == "$project":
+                docs = [project(d, arg) for d in docs]
+            elif op == "$unionWith":
+                other = self._store.collection(arg["coll"] if isinstance(arg, dict) else arg)
+                docs += list(other.aggregate(arg.get("pipeline", []) if isinstance(arg, dict) else []))
+            elif op == "$group":
+                docs = self._group(docs, arg)
+            elif op == "$sort":
+                docs = LocalCursor(docs).sort(list(arg.items()))
+            elif op == "$limit":
+                docs = docs[:arg]
+            else:
+                raise NotImplementedError(f"Étape non supportée par le backend local : {op}")
+        return LocalCursor(docs)
+
+    @staticmethod
+    def _group(docs: list, spec: dict) -> list:
+        groups: dict[Any, dict] = {}
+        for doc in docs:
+            key = _eval(spec["_id"], doc)
+            hkey = json.dumps(key, sort_keys=True, default=str)
+            out = groups.setdefault(hkey, {"_id": key})
+            for field, acc in spec.items():
+                if field == "_id":
+                    continue
+                (op, expr), = acc.items()
+                value = _eval(expr, doc)
+                if op == "$push":
+                    out.setdefault(field, []).append(value)
+                elif op == "$addToSet":
+                    out.setdefault(field, [])
+                    if value not in out[field]:
+                        out[field].append(value)
+                elif op == "$first":
+                    out.setdefault(field, value)
+                elif op == "$sum":
+                    out[field] = out.get(field, 0) + (value if isinstance(value, (int, float)) else 0)
+                else:
+                    raise NotImplementedError(f"Accumulateur non supporté par le backend local : {op}")
+        return list(groups.values())
+
+    def create_indexes(self, indexes) -> list:
+        # Index date / date_iso déjà présents dans le schéma SQLite
+        return []
+
+    def _read_only(self, *args, **kwargs):
+        raise ReadOnlyBackendError(f"Backend local en lecture seule ({self.name})")
+
+    insert_one = insert_many = update_one = update_many = delete_one = delete_many = _read_only
+    replace_one = bulk_write = find_one_and_update = _read_only
+
+
+class LocalStore:
+    """Connexion SQLite en lecture seule, une par thread (et par processus)."""
+
+    def __init__(self, db_path: Path = LOCAL_STORE_PATH, zip_path: Path = CONTENT_ZIP):
+        self._db_path = Path(db_path)
+        self._zip_path = Path(zip_path)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._ready = False
+
+    def _ensure_built(self) -> None:
+        if self._ready:
+            return
+        with self._lock:
+            if not self._ready:
+                if not _is_current(self._db_path, self._zip_path):
+                    build_store(self._db_path, self._zip_path)
+                self._ready = True
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            self._ensure_built()
+            conn = sqlite3.connect(f"file:{self._db_path}?mode=ro", uri=True, check_same_thread=False)
+            conn.execute("PRAGMA mmap_size = 67108864")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def execute(self, sql: str, args: Iterable = ()):
+        return self._conn().execute(sql, tuple(args))
+
+    def collection(self, name: str) -> LocalCollection:
+        return LocalCollection(self, name)
+
+
+class LocalDatabase:
+    """Équivalent minimal de pymongo.database.Database pour le backend local."""
+
+    def __init__(self, store: LocalStore, name: str):
+        self._store = store
+        self.name = name
+
+    def __getitem__(self, name: str) -> LocalCollection:
+        return self._store.collection(name)
+
+    get_collection = __getitem__
+
+    def watch(self, *args, **kwargs):
+        raise NotImplementedError("Change streams indisponibles avec le backend local")
+
+    def command(self, *args, **kwargs):
+        raise NotImplementedError("Commandes MongoDB indisponibles avec le backend local")
+
+
+_STORE: Optional[LocalStore] = None
+
+
+def get_store() -> LocalStore:
+    global _STORE
+    if _STORE is None:
+        _STORE = LocalStore()
+    return _STORE
+
+
+if __name__ == "__main__":
+    build_store()
@@ -1,13 +1,7 @@
 # logic/locations.py
-from pymongo import MongoClient
-import os
-from dotenv import load_dotenv
+from logic.database import collection as _collection
 
-load_dotenv()
-
-client = MongoClient(os.getenv("MONGO_URI"))
-db = client["foire_db"]
-collection = db["programmes_foire_2023"]
+collection = _collection("programmes_foire_2023", db_name="foire_db")
 
 def get_location_info():
     # Exemple : récupérer tous les lieux uniques
@@ -0,0 +1,238 @@
+# logic/programme_snapshot.py
+"""
+Instantané en mémoire (par processus) des collections programmes_foire_2023
+et programmes_enfant_2023.
+- chargé une fois au démarrage, indexé par date canonique, public et salle ;
+- rafraîchi après PROGRAMME_SNAPSHOT_TTL secondes, ou dès qu'un change
+  stream MongoDB signale une modification (PROGRAMME_SNAPSHOT_WATCH=1) ;
+- le chemin chaud ne fait aucun aller-retour MongoDB.
+"""
+
+import hashlib
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Iterable, Optional
+
+from text_normalizer import fold
+
+PROGRAMME_SNAPSHOT_TTL = float(os.getenv("PROGRAMME_SNAPSHOT_TTL", "300"))
+PROGRAMME_SNAPSHOT_WATCH = os.getenv("PROGRAMME_SNAPSHOT_WATCH", "0") == "1"
+
+# Libellés de public (clés de LABELS dans logic/translator.py)
+PUBLIC_TOUS = "🧑‍🦰 Tous publics"
+PUBLIC_ENFANTS = "👶 Enfants"
+
+_SPACES = re.compile(r"\s+")
+
+
+def room_key(salle: str) -> str:
+    """Clé de salle tolérante : « Salle de Babel », « salle babel » → « babel »."""
+    s = _SPACES.sub(" ", fold(salle or "")).strip()
+    return re.sub(r"^salle( de)? ", "", s)
+
+
+def _intern(value) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(frozen=True, slots=True)
+class ProgrammeEvent:
+    """
+    Événement compact : la collection d'origine est un champ (plus de
+    comparaison de dicts pour retrouver le public), les chaînes répétées
+    (salles, accès, dates, horaires) sont internées.
+    """
+    titre: Optional[str]
+    date: Optional[str]
+    date_iso: Optional[str]       # « 2023-04-28 », calculé à l'ingestion
+    heure: Optional[str]
+    salle: Optional[str]
+    directeur: Optional[str]
+    acces: Optional[str]
+    source: str                   # collection MongoDB d'origine
+    audience: str                 # "adulte" / "enfant"
+
+    @property
+    def public(self) -> str:
+        return PUBLIC_ENFANTS if self.audience == "enfant" else PUBLIC_TOUS
+
+    @classmethod
+    def from_document(cls, doc: dict, source: str, audience: str) -> "ProgrammeEvent":
+        return cls(
+            titre=doc.get("titre"),
+            date=_intern(doc.get("date")),
+            date_iso=_intern(doc.get("date_iso")),
+            heure=_intern(doc.get("heure")),
+            salle=_intern(doc.get("salle")),
+            directeur=_intern(doc.get("directeur")),
+            acces=_intern(doc.get("Accés")),
+            source=sys.intern(source),
+            audience=sys.intern(audience),
+        )
+
+
+@dataclass(frozen=True)
+class ProgrammeDay:
+    key: str                      # date canonique (ISO) ou libellé replié
+    label: str                    # date telle qu'enregistrée en base
+    date: Optional[datetime]      # None si la date n'a pas pu être analysée
+    events: tuple = ()            # ProgrammeEvent — foire puis enfants
+
+
+@dataclass(frozen=True)
+class ProgrammeSnapshot:
+    days: tuple                   # ProgrammeDay triés par date
+    by_date: dict                 # clé canonique → ProgrammeDay
+    by_audience: dict             # "adulte" / "enfant" → (ProgrammeEvent, …)
+    by_salle: dict                # room_key → (ProgrammeEvent, …)
+    loaded_at: float
+    parse_date: Callable[[str], datetime] = field(repr=False)
+    version: str = ""             # empreinte du contenu : identique si rien n'a changé
+
+    def canonical_date(self, date_str: str) -> str:
+        return canonical_date(date_str, self.parse_date)
+
+    def day(self, date_str: str) -> Optional[ProgrammeDay]:
+        return self.by_date.get(self.canonical_date(date_str))
+
+    def dated_days(self) -> list:
+        return [d for d in self.days if d.date is not None]
+
+    def in_salle(self, salle: str) -> tuple:
+        return self.by_salle.get(room_key(salle), ())
+
+
+def canonical_date(date_str: str, parse_date: Callable[[str], datetime]) -> str:
+    """« 28 Avril 2023 », « 28 avril 2023 » → « 2023-04-28 »."""
+    try:
+        return parse_date(date_str).date().isoformat()
+    except (ValueError, AttributeError, TypeError):
+        return _SPACES.sub(" ", fold(str(date_str or ""))).strip()
+
+
+def build_snapshot(groups: Iterable[dict], parse_date: Callable[[str], datetime],
+                   audiences: dict[str, str]) -> ProgrammeSnapshot:
+    """
+    groups : documents {"_id": date, "events": [...]} tels que renvoyés par
+    l'agrégation de logic/programmes.py ; chaque événement porte sa
+    collection d'origine dans le champ "source".
+    audiences : collection → public ("adulte" / "enfant").
+    """
+    days: dict[str, dict[str, Any]] = {}
+    by_audience = {"adulte": [], "enfant": []}
+    by_salle: dict[str, list] = {}
+
+    for group in groups:
+        label = group.get("_id")
+        events = []
+        for doc in group.get("events", []):
+            source = doc.get("source", "")
+            ev = ProgrammeEvent.from_document(doc, source, audiences.get(source, "adulte"))
+            by_audience[ev.audience].append(ev)
+            events.append(ev)
+            if ev.salle:
+                by_salle.setdefault(room_key(ev.salle), []).append(ev)
+        if not label:
+            continue
+        # Date ISO précalculée à l'ingestion : aucune analyse nécessaire
+        iso = next((ev.date_iso for ev in events if ev.date_iso), None)
+        key = iso or canonical_date(label, parse_date)
+        day = days.get(key)
+        if day is None:
+            try:
+                parsed = datetime.fromisoformat(iso) if iso else parse_date(label)
+            except (ValueError, AttributeError, TypeError):
+                parsed = None
+                print(f"[WARN] Date de programme non reconnue : {label!r}")
+            day = days[key] = {"label": label, "date": parsed, "events": []}
+        day["events"].extend(events)
+
+    # Le public adulte précède le public enfant dans chaque journée
+    for day in days.values():
+        day["events"].sort(key=lambda ev: ev.audience == "enfant")
+
+    ordered = sorted(days.items(), key=lambda kv: (kv[1]["date"] is None, kv[1]["date"] or datetime.min))
+    day_objs = tuple(ProgrammeDay(key=k, label=d["label"], date=d["date"], events=tuple(d["events"]))
+                     for k, d in ordered)
+    return ProgrammeSnapshot(
+        days=day_objs,
+        version=hashlib.sha1(repr(day_objs).encode("utf-8")).hexdigest(),
+        by_date={d.key: d for d in day_objs},
+        by_audience={k: tuple(v) for k, v in by_audience.items()},
+        by_salle={k: tuple(v) for k, v in by_salle.items()},
+        loaded_at=time.time(),
+        parse_date=parse_date,
+    )
+
+
+class SnapshotStore:
+    """
+    Détient l'instantané courant et le remplace par swap atomique.
+    Comme ModelRegistry : le chemin chaud ne prend aucun verrou, un seul
+    thread recharge pendant que les autres servent l'ancien instantané.
+    """
+
+    def __init__(self, loader: Callable[[], ProgrammeSnapshot],
+                 ttl: float = PROGRAMME_SNAPSHOT_TTL,
+                 watch: Optional[Callable[[], Any]] = None):
+        self._loader = loader
+        self._ttl = ttl
+        self._watch = watch           # renvoie un change stream (itérable) ou None
+        self._snapshot: Optional[ProgrammeSnapshot] = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+        self._watcher_pid = None
+
+    def get(self) -> ProgrammeSnapshot:
+        snap = self._snapshot
+        if snap is not None and time.monotonic() < self._expires:
+            return snap
+
+        if not self._lock.acquire(blocking=snap is None):
+            return snap
+        try:
+            snap = self._snapshot
+            if snap is not None and time.monotonic() < self._expires:
+                return snap
+            try:
+                snap = self._loader()
+                self._snapshot = snap
+                self._expires = time.monotonic() + self._ttl
+                n = sum(len(d.events) for d in snap.days)
+                print(f"🔄 Programmes chargés en mémoire ({len(snap.days)} jours, {n} événements)")
+            except Exception as e:
+                if snap is None:
+                    raise
+                # MongoDB indisponible : on garde l'ancien instantané et on réessaie plus tard
+                print(f"[WARN] Rafraîchissement des programmes ignoré : {e}")
+                self._expires = time.monotonic() + min(self._ttl, 30.0)
+            self._ensure_watcher()
+            return snap
+        finally:
+            self._lock.release()
+
+    def invalidate(self) -> None:
+        """Force un rechargement au prochain appel."""
+        self._expires = 0.0
+
+    # -----------------------------------------------------------------
+    def _ensure_watcher(self) -> None:
+        # Un thread par processus (les workers forkés ne l'héritent pas)
+        if self._watch is None or self._watcher_pid == os.getpid():
+            return
+        self._watcher_pid = os.getpid()
+        threading.Thread(target=self._run_watcher, name="programme-watch", daemon=True).start()
+
+    def _run_watcher(self) -> None:
+        try:
+            with self._watch() as stream:
+                for _change in stream:
+                    self.invalidate()
+        except Exception as e:
+            # Ex. serveur autonome sans replica set : seul le TTL s'applique
+            print(f"[WARN] Change stream des programmes indisponible ({e}) → rafraîchissement par TTL")
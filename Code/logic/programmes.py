@@ -1,156 +1,107 @@
-from pymongo import MongoClient
 import os
-from datetime import datetime
-from dotenv import load_dotenv
-import locale
-from deep_translator import GoogleTranslator
+from logic.database import collection, get_db
+from logic.dates import format_date_fr, parse_date_fr
+from logic.programme_snapshot import (
+    PROGRAMME_SNAPSHOT_WATCH, SnapshotStore, build_snapshot,
+)
+from logic.translator import LABELS, SAFE_KEYS, SUPPORTED_LANGS, translate_tree
 
 
 # =========================================
 # 🌍 TRADUCTION AUTOMATIQUE
 # =========================================
+# Feuilles uniques traduites en un seul lot, via le cache — cf. logic/translator.py
 
-SUPPORTED_LANGS = ["fr", "en", "de", "ar", "ja", "zh"]
+def translate_any(value, lang="fr"):
+    return translate_tree(value, lang)
 
+# 📅 Dates : analyse indépendante de la locale, mémoïsée (cf. logic/dates.py)
+def parser_date(date_str):
+    return parse_date_fr(date_str)
 
-_TRANSLATORS = {}
+# 🔌 Collections MongoDB (client partagé, cf. logic/database.py)
+programmes_foire_2023 = collection("programmes_foire_2023")
+programmes_enfant_2023 = collection("programmes_enfant_2023")
 
-def get_translator(lang):
-    if lang not in _TRANSLATORS:
-        _TRANSLATORS[lang] = GoogleTranslator(source="fr", target=lang)
-    return _TRANSLATORS[lang]
 
+# Seuls les champs utilisés par les réponses sont rapatriés
+PROGRAMME_FIELDS = ("date", "date_iso", "heure", "titre", "salle", "directeur", "Accés")
+PROGRAMME_BATCH_SIZE = int(os.getenv("PROGRAMME_BATCH_SIZE", "500"))
 
-SAFE_KEYS = {"date", "heure"}
 
-LABELS = {
-    "👶 Enfants": {
-        "en": "👶 Children",
-        "de": "👶 Kinder",
-        "ar": "👶 أطفال",
-        "ja": "👶 子供向け",
-        "zh": "👶 儿童"
-    },
-    "🧑‍🦰 Tous publics": {
-        "en": "🧑‍🦰 All audiences",
-        "de": "🧑‍🦰 Für alle",
-        "ar": "🧑‍🦰 لجميع الفئات",
-        "ja": "🧑‍🦰 全年齢対象",
-        "zh": "🧑‍🦰 适合所有人"
-    }
+# Public associé à chaque collection (porté par ProgrammeEvent.source)
+PROGRAMME_AUDIENCES = {
+    programmes_foire_2023.name: "adulte",
+    programmes_enfant_2023.name: "enfant",
 }
 
 
+def _projection(collection):
+    proj = {"_id": 0, "source": {"$literal": collection.name}}
+    proj.update({f: 1 for f in PROGRAMME_FIELDS})
+    return proj
 
-def translate_any(value, lang="fr"):
-    if lang == "fr" or lang not in SUPPORTED_LANGS:
-        return value
 
-    try:
-        translator = get_translator(lang)
+def iter_programme_days():
+    """
+    Un seul aller-retour : programmes adultes + enfants ($unionWith),
+    regroupés par date, parcourus en flux (curseur par lots).
+    """
+    pipeline = [
+        {"$project": _projection(programmes_foire_2023)},
+        {"$unionWith": {
+            "coll": programmes_enfant_2023.name,
+            "pipeline": [{"$project": _projection(programmes_enfant_2023)}],
+        }},
+        {"$group": {"_id": "$date", "events": {"$push": "$$ROOT"}}},
+    ]
+    return programmes_foire_2023.aggregate(pipeline, batchSize=PROGRAMME_BATCH_SIZE)
 
-        # 🔹 Cas STRING
-        if isinstance(value, str):
-            # 1️⃣ Traduction manuelle prioritaire (LABELS)
-            if value in LABELS and lang in LABELS[value]:
-                return LABELS[value][lang]
 
-            # 2️⃣ Traduction automatique
-            return translator.translate(value)
+def _charger_programmes():
+    with iter_programme_days() as cursor:
+        return build_snapshot(cursor, parser_date, PROGRAMME_AUDIENCES)
 
-        # 🔹 Cas LISTE
-        if isinstance(value, list):
-            return [translate_any(v, lang) for v in value]
 
-        # 🔹 Cas DICT
-        if isinstance(value, dict):
-            return {
-                k: (
-                    v if k in SAFE_KEYS
-                    else translate_any(v, lang)
-                )
-                for k, v in value.items()
-            }
+def _surveiller_programmes():
+    pipeline = [{"$match": {"ns.coll": {"$in": [programmes_foire_2023.name, programmes_enfant_2023.name]}}}]
+    return get_db().watch(pipeline)
 
 
-        return value
-    except Exception as e:
-        print(f"[WARN] Erreur traduction ({lang}) : {e}")
-        return value
+_SNAPSHOT = SnapshotStore(_charger_programmes,
+                          watch=_surveiller_programmes if PROGRAMME_SNAPSHOT_WATCH else None)
 
-# 🌍 Locale française
-try:
-    locale.setlocale(locale.LC_TIME, 'French_France.1252')  # Windows
-except locale.Error:
-    try:
-        locale.setlocale(locale.LC_TIME, 'fr_FR.UTF-8')  # Linux/Mac
-    except locale.Error:
-        print("⚠️ Locale française non disponible. Utilisation d'une conversion manuelle.")
-
-# 🔁 Conversion manuelle des mois FR → EN
-def convertir_date_fr_to_en(date_str):
-    mois_fr_en = {
-        "janvier": "January", "février": "February", "mars": "March",
-        "avril": "April", "mai": "May", "juin": "June",
-        "juillet": "July", "août": "August", "septembre": "September",
-        "octobre": "October", "novembre": "November", "décembre": "December"
-    }
-    for fr, en in mois_fr_en.items():
-        date_str = date_str.lower().replace(fr, en)
-    return date_str
 
-def parser_date(date_str):
-    try:
-        return datetime.strptime(date_str.strip(), "%d %B %Y")
-    except ValueError:
-        try:
-            date_en = convertir_date_fr_to_en(date_str)
-            return datetime.strptime(date_en.strip(), "%d %B %Y")
-        except Exception as e:
-            raise ValueError(f"Erreur lors de l’analyse des dates : {e}")
-
-# 🔌 Connexion MongoDB
-load_dotenv()
-MONGO_URI = os.getenv("MONGO_URI")
-if not MONGO_URI:
-    raise RuntimeError("❌ MONGO_URI non défini")
-
-client = MongoClient(MONGO_URI)
-db = client["chatbotEvent"]
-programmes_foire_2023 = db["programmes_foire_2023"]
-programmes_enfant_2023 = db["programmes_enfant_2023"]
+def get_programmes_snapshot():
+    """Instantané courant des programmes (chargé au premier appel / au démarrage)."""
+    return _SNAPSHOT.get()
 
 # =========================================
 # --- Réponses BRÈVES
 # =========================================
 def get_programme_duration_global(lang="fr"):
-    dates_foire = programmes_foire_2023.distinct("date")
-    dates_enfant = programmes_enfant_2023.distinct("date")
-    all_dates = list(set(dates_foire + dates_enfant))
-    if not all_dates:
+    days = get_programmes_snapshot().dated_days()
+    if not days:
         return "Aucune date trouvée dans les programmes."
     try:
-        dates_dt = [parser_date(d) for d in all_dates]
-        dates_dt.sort()
-        debut = dates_dt[0].strftime("%d %B")
-        fin = dates_dt[-1].strftime("%d %B")
+        dates_dt = [d.date for d in days]
+        debut = format_date_fr(dates_dt[0])
+        fin = format_date_fr(dates_dt[-1])
         result =  f"📅 Le programme global se déroulera du {debut} au {fin}."
     except Exception as e:
         return str(e)
     return translate_any(result, lang)
 
 def get_programme_by_date_global(date_str, lang="fr"):
-    events_foire = list(programmes_foire_2023.find({"date": date_str}))
-    events_enfant = list(programmes_enfant_2023.find({"date": date_str}))
-    total_events = events_foire + events_enfant
-    if not total_events:
+    day = get_programmes_snapshot().day(date_str)
+    if day is None or not day.events:
         return f"Aucun événement trouvé pour le {date_str}."
     lines = []
-    for e in total_events:
-        titre = e.get("titre", "Sans titre")
-        heure = e.get("heure", "Heure inconnue")
-        salle = e.get("salle", "Lieu inconnu")
-        public = "👶 Enfants" if e in events_enfant else "🧑‍🦰 Tous publics"
+    for e in day.events:
+        titre = e.titre or "Sans titre"
+        heure = e.heure or "Heure inconnue"
+        salle = e.salle or "Lieu inconnu"
+        public = e.public
         lines.append(f"- {public} – {titre} — {heure} dans {salle}")
     result = f"📅 Événements du {date_str} :\n" + "\n".join(lines)
     return translate_any(result, lang)
@@ -170,32 +121,29 @@ def get_event_price_global(event_name=None, lang="fr"):
     if event_name:
         # Exemple simplifié : certains événements peuvent avoir des prix différents
         if "concert" in event_name.lower():
-            return "Le prix du concert est de 20 TND."
+            return translate_any("Le prix du concert est de 20 TND.", lang)
         elif "atelier" in event_name.lower():
-            return "Le prix de l'atelier est de 15 TND."
+            return translate_any("Le prix de l'atelier est de 15 TND.", lang)
     
     # Par défaut → prix généraux
     result = f"Les prix sont : Adulte {prix_generaux['adulte']}, Enfant {prix_generaux['enfant']}, Étudiant {prix_generaux['etudiant']}."
     return translate_any(result, lang)
 
 def get_programme_enfant_general_global(lang="fr"):
-    events = list(programmes_enfant_2023.find())
+    events = get_programmes_snapshot().by_audience["enfant"]
     if not events:
         return "Aucun événement pour enfants trouvé."
-    titres = [e.get("titre", "Événement sans titre").strip() for e in events]
+    titres = [(e.titre or "Événement sans titre").strip() for e in events]
     result = "🎠 Activités enfants prévues :\n- " + "\n- ".join(sorted(set(titres)))
     return translate_any(result, lang)
 
 def get_all_programme_combined_dates_global(lang="fr"):
-    dates_foire = programmes_foire_2023.distinct("date")
-    dates_enfant = programmes_enfant_2023.distinct("date")
-    all_dates = list(set(dates_foire + dates_enfant))
-    if not all_dates:
+    days = get_programmes_snapshot().dated_days()
+    if not days:
         return "Aucune date trouvée dans les programmes."
     try:
-        dates_dt = [parser_date(d) for d in all_dates]
-        dates_dt.sort()
-        dates_str = [d.strftime("%d %B %Y") for d in dates_dt]
+        dates_dt = [d.date for d in days]
+        dates_str = [format_date_fr(d, year=True) for d in dates_dt]
         result = "📅 Dates couvertes par les programmes :\n- " + "\n- ".join(dates_str)
         return translate_any(result, lang)
     except Exception as e:
@@ -231,9 +179,8 @@ def get_editors_count_global(lang="fr"):
 # --- Réponses DÉTAILLÉES (LISTE STRUCTURÉE POUR FRONT-END)
 # =========================================
 def get_programme_by_date_detailed(date_str, lang="fr"):
-    events_foire = list(programmes_foire_2023.find({"date": date_str}))
-    events_enfant = list(programmes_enfant_2023.find({"date": date_str}))
-    total_events = events_foire + events_enfant
+    day = get_programmes_snapshot().day(date_str)
+    total_events = day.events if day else ()
 
     if not total_events:
         result = {
@@ -246,10 +193,10 @@ def get_programme_by_date_detailed(date_str, lang="fr"):
     for e in total_events:
         details.append({
             "date": date_str,
-            "heure": e.get("heure", "Heure inconnue"),
-            "titre": e.get("titre", "Sans titre"),
-            "salle": e.get("salle", "Lieu inconnu"),
-            "public": "👶 Enfants" if e in events_enfant else "🧑‍🦰 Tous publics"
+            "heure": e.heure or "Heure inconnue",
+            "titre": e.titre or "Sans titre",
+            "salle": e.salle or "Lieu inconnu",
+            "public": e.public
         })
 
     result = {
@@ -260,30 +207,24 @@ def get_programme_by_date_detailed(date_str, lang="fr"):
 
 def get_programme_date_range_detailed(lang="fr"):
     """Retourne résumé + liste complète des événements pour toutes les dates"""
-    dates_foire = programmes_foire_2023.distinct("date")
-    dates_enfant = programmes_enfant_2023.distinct("date")
-    all_dates = sorted(list(set(dates_foire + dates_enfant)), key=lambda d: parser_date(d))
+    days = get_programmes_snapshot().dated_days()
     
-    if not all_dates:
+    if not days:
         return {"summary": "Aucune date trouvée", "details": []}
     
-    summary = f"{len(all_dates)} jours, commence le {all_dates[0]} et termine le {all_dates[-1]}"
+    summary = f"{len(days)} jours, commence le {days[0].label} et termine le {days[-1].label}"
     
     details = []
-    for date in all_dates:
-        events_foire = list(programmes_foire_2023.find({"date": date}))
-        events_enfant = list(programmes_enfant_2023.find({"date": date}))
-        total_events = events_foire + events_enfant
-        
+    for day in days:
         day_events = []
-        for e in total_events:
+        for e in day.events:
             day_events.append({
-                "heure": e.get("heure"),
-                "titre": e.get("titre"),
-                "salle": e.get("salle"),
-                "public": "👶 Enfants" if e in events_enfant else "🧑‍🦰 Tous publics"
+                "heure": e.heure,
+                "titre": e.titre,
+                "salle": e.salle,
+                "public": e.public
             })
-        details.append({"date": date, "events": day_events})
+        details.append({"date": day.label, "events": day_events})
     
     result = {"summary": summary, "details": details}
     return translate_any(result, lang)
@@ -292,54 +233,64 @@ def get_all_programmes_detailed(lang="fr"):
     """
     Retourne une version détaillée du programme complet avec toutes les informations.
     """
-    dates_foire = programmes_foire_2023.distinct("date")
-    dates_enfant = programmes_enfant_2023.distinct("date")
-    all_dates = sorted(list(set(dates_foire + dates_enfant)), key=lambda d: parser_date(d))
+    days = get_programmes_snapshot().dated_days()
 
-    if not all_dates:
+    if not days:
         return {"summary": "Aucun programme trouvé", "details": []}
 
-    summary = f"📅 Programme complet sur {len(all_dates)} jours."
+    summary = f"📅 Programme complet sur {len(days)} jours."
 
     details = []
-    for date in all_dates:
-        events_foire = list(programmes_foire_2023.find({"date": date}))
-        events_enfant = list(programmes_enfant_2023.find({"date": date}))
-        total_events = events_foire + events_enfant
-
-        if not total_events:
+    for day in days:
+        if not day.events:
             continue
 
         day_events = []
-        for e in total_events:
+        for e in day.events:
             day_events.append({
-                "date": date,
-                "heure": e.get("heure", "Heure inconnue"),
-                "titre": e.get("titre", "Sans titre"),
-                "salle": e.get("salle", "Lieu inconnu"),
-                "public": "👶 Enfants" if e in events_enfant else "🧑‍🦰 Tous publics"
+                "date": day.label,
+                "heure": e.heure or "Heure inconnue",
+                "titre": e.titre or "Sans titre",
+                "salle": e.salle or "Lieu inconnu",
+                "public": e.public
             })
-        details.append({"date": date, "events": day_events})
+        details.append({"date": day.label, "events": day_events})
 
     result = {"summary": summary, "details": details}
     return translate_any(result, lang)
 
 def get_programme_enfant_general_detailed(lang="fr"):
-    brief = get_programme_enfant_general_global(lang)
-    events = list(programmes_enfant_2023.find())
+    # Résumé construit en français : traduit une seule fois avec les détails
+    brief = get_programme_enfant_general_global()
+    events = get_programmes_snapshot().by_audience["enfant"]
     if not events:
-        return brief
+        return translate_any(brief, lang)
     details = []
     for e in events:
         details.append({
-            "date": e.get("date"),
-            "heure": e.get("heure"),
-            "titre": e.get("titre"),
-            "salle": e.get("salle")
+            "date": e.date,
+            "heure": e.heure,
+            "titre": e.titre,
+            "salle": e.salle
         })
     result = {"summary": brief, "details": details}
     return translate_any(result, lang)
 
+def get_programme_by_salle_detailed(salle, lang="fr"):
+    """Événements d'une salle (index par salle de l'instantané)."""
+    events = get_programmes_snapshot().in_salle(salle)
+    if not events:
+        result = {"summary": f"Aucun événement trouvé dans la salle {salle}.", "details": []}
+        return translate_any(result, lang)
+    details = [{
+        "date": e.date,
+        "heure": e.heure or "Heure inconnue",
+        "titre": e.titre or "Sans titre",
+        "public": e.public
+    } for e in events]
+    result = {"summary": f"📍 Événements – {events[0].salle.strip()}", "details": details}
+    return translate_any(result, lang)
+
 def get_event_locations_detailed(lang="fr"):
     result = {
         "summary": get_event_locations_global(),
@@ -354,7 +305,7 @@ def get_event_locations_detailed(lang="fr"):
 
 
 def get_event_hours_detailed(lang="fr"):
-    brief = get_event_hours_global(lang)
+    brief = get_event_hours_global()
     result = {
         "summary": brief,
         "details": [
@@ -369,11 +320,12 @@ def get_event_price_detailed(event_name=None, lang="fr"):
     """
     if event_name:
         if "concert" in event_name.lower():
-            return ("Le tarif pour assister au concert est fixé à 20 TND par personne. "
-                    "Il est recommandé d’acheter vos billets à l’avance car les places sont limitées.")
+            return translate_any("Le tarif pour assister au concert est fixé à 20 TND par personne. "
+                                 "Il est recommandé d’acheter vos billets à l’avance car les places sont limitées.",
+                                 lang)
         elif "atelier" in event_name.lower():
-            return ("La participation à l’atelier coûte 15 TND. "
-                    "Ce tarif inclut le matériel de base fourni sur place.")
+            return translate_any("La participation à l’atelier coûte 15 TND. "
+                                 "Ce tarif inclut le matériel de base fourni sur place.", lang)
     
     # Réponse générale détaillée
     result = ("Les tarifs d’entrée sont organisés en plusieurs catégories :\n"
@@ -563,4 +515,5 @@ __all__ = [
    "get_programme_date_range", "get_event_locations_global", "get_event_hours_global", "get_event_price_global",    "get_editors_count_global","get_event_locations_detailed", "get_event_hours_detailed", "get_programme_enfant_general_detailed", 
    "get_editors_count_detailed",  "get_event_duration_detailed", "get_event_hours_detailed", "get_event_locations_detailed", "get_programme_by_date_detailed",
    "get_event_price_detailed", "get_programme_date_range_detailed" ,"get_all_programmes_detailed",  "get_editors_countries_of_origin",
+   "get_programmes_snapshot", "get_programme_by_salle_detailed",
 ]
@@ -0,0 +1,175 @@
+# logic/translation_cache.py
+"""
+Cache des traductions automatiques (texte français, langue cible) → texte.
+- niveau 1 : LRU en mémoire, par processus ;
+- niveau 2 : SQLite en mode WAL sur disque, partagé par tous les workers
+  gunicorn et conservé entre les redémarrages ;
+- préchargement des entrées les plus récentes au démarrage ;
+- compteurs de succès par niveau (stats()).
+Une erreur disque ne bloque jamais une réponse : le cache se replie sur
+la mémoire seule.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Optional
+
+TRANSLATION_CACHE_PATH = Path(os.getenv("TRANSLATION_CACHE_PATH") or
+                              Path(__file__).resolve().parent.parent / "local_data" / "traductions.sqlite")
+TRANSLATION_CACHE_SIZE = int(os.getenv("TRANSLATION_CACHE_SIZE", "4096"))
+TRANSLATION_CACHE_DISK = os.getenv("TRANSLATION_CACHE_DISK", "1") != "0"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    lang TEXT NOT NULL,
+    src TEXT NOT NULL,
+    dst TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (lang, src)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS translations_recent ON translations (updated_at);
+"""
+
+
+class TranslationCache:
+    def __init__(self, path: Optional[Path] = TRANSLATION_CACHE_PATH,
+                 size: int = TRANSLATION_CACHE_SIZE):
+        self._path = Path(path) if path else None
+        self._size = size
+        self._memory: "OrderedDict[tuple[str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats = {"memory": 0, "disk": 0, "miss": 0, "writes": 0}
+
+    # -----------------------------------------------------------------
+    # Niveau disque
+    # -----------------------------------------------------------------
+    def _conn(self) -> Optional[sqlite3.Connection]:
+        if self._path is None:
+            return None
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            try:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self._path, timeout=2.0, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode = WAL")
+                conn.execute("PRAGMA synchronous = NORMAL")
+                conn.executescript(_SCHEMA)
+            except sqlite3.Error as e:
+                print(f"[WARN] Cache des traductions sur disque désactivé : {e}")
+                self._path = None
+                return None
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _disk_get(self, keys: list[tuple[str, str]]) -> dict:
+        conn = self._conn()
+        if conn is None or not keys:
+            return {}
+        found = {}
+        try:
+            for lang in {lang for _, lang in keys}:
+                srcs = [src for src, l in keys if l == lang]
+                for i in range(0, len(srcs), 500):
+                    chunk = srcs[i:i + 500]
+                    rows = conn.execute(
+                        f"SELECT src, dst FROM translations WHERE lang = ? AND src IN ({','.join('?' * len(chunk))})",
+                        (lang, *chunk))
+                    found.update(((src, lang), dst) for src, dst in rows)
+        except sqlite3.Error as e:
+            print(f"[WARN] Lecture du cache des traductions : {e}")
+        return found
+
+    def _disk_put(self, items: dict) -> None:
+        conn = self._conn()
+        if conn is None or not items:
+            return
+        now = time.time()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO translations (lang, src, dst, updated_at) VALUES (?, ?, ?, ?)",
+                    [(lang, src, dst, now) for (src, lang), dst in items.items()])
+        except sqlite3.Error as e:
+            print(f"[WARN] Écriture du cache des traductions : {e}")
+
+    # -----------------------------------------------------------------
+    # Niveau mémoire
+    # -----------------------------------------------------------------
+    def _remember(self, items: dict) -> None:
+        with self._lock:
+            for key, value in items.items():
+                self._memory[key] = value
+                self._memory.move_to_end(key)
+            while len(self._memory) > self._size:
+                self._memory.popitem(last=False)
+
+    # -----------------------------------------------------------------
+    def get_many(self, texts: Iterable[str], lang: str) -> dict[str, str]:
+        """Traductions connues parmi `texts` ({texte: traduction})."""
+        found, missing = {}, []
+        with self._lock:
+            for text in dict.fromkeys(texts):
+                key = (text, lang)
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[text] = self._memory[key]
+                else:
+                    missing.append(key)
+            self._stats["memory"] += len(found)
+        if missing:
+            from_disk = self._disk_get(missing)
+            self._remember(from_disk)
+            found.update((src, dst) for (src, _), dst in from_disk.items())
+            with self._lock:
+                self._stats["disk"] += len(from_disk)
+                self._stats["miss"] += len(missing) - len(from_disk)
+        return found
+
+    def get(self, text: str, lang: str) -> Optional[str]:
+        return self.get_many((text,), lang).get(text)
+
+    def put_many(self, translations: dict[str, str], lang: str) -> None:
+        items = {(src, lang): dst for src, dst in translations.items() if src and dst}
+        self._remember(items)
+        self._disk_put(items)
+        with self._lock:
+            self._stats["writes"] += len(items)
+
+    def put(self, text: str, lang: str, translated: str) -> None:
+        self.put_many({text: translated}, lang)
+
+    def preload(self, limit: Optional[int] = None) -> int:
+        """Charge en mémoire les entrées disque les plus récentes."""
+        conn = self._conn()
+        if conn is None:
+            return 0
+        try:
+            rows = conn.execute(
+                "SELECT src, lang, dst FROM translations ORDER BY updated_at DESC LIMIT ?",
+                (limit or self._size,)).fetchall()
+        except sqlite3.Error as e:
+            print(f"[WARN] Préchargement du cache des traductions : {e}")
+            return 0
+        # Les plus récentes en dernier : ce sont les dernières évincées
+        self._remember({(src, lang): dst for src, lang, dst in reversed(rows)})
+        return len(rows)
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            s = dict(self._stats)
+            s["memory_entries"] = len(self._memory)
+        lookups = s["memory"] + s["disk"] + s["miss"]
+        s["hit_rate"] = (s["memory"] + s["disk"]) / lookups if lookups else 0.0
+        return s
+
+
+TRANSLATIONS = TranslationCache(TRANSLATION_CACHE_PATH if TRANSLATION_CACHE_DISK else None)
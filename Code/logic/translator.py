@@ -0,0 +1,374 @@
+# logic/translator.py
+"""
+Traduction des réponses en deux phases :
+1. collecte des feuilles traduisibles UNIQUES de tout l'arbre
+   ({summary, details}, listes, chaînes), hors SAFE_KEYS et LABELS ;
+2. une seule requête groupée au backend pour celles absentes du cache
+   (cf. logic/translation_cache.py) et, s'il est activé, du catalogue
+   statique (cf. logic/catalog.py), puis reconstruction de l'arbre.
+Le backend est interchangeable (TRANSLATION_BACKEND=google|local) ;
+« local » est un traducteur factice, sans réseau, pour les tests.
+
+Les lots partent en parallèle sur un pool de threads borné, avec une
+échéance par requête : ce qui n'est pas traduit à temps reste en français
+(et rejoint le cache à l'arrivée). Un disjoncteur coupe le backend après
+des échecs consécutifs, le temps qu'il se rétablisse.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from logic.translation_cache import TRANSLATIONS, TranslationCache
+
+SUPPORTED_LANGS = ["fr", "en", "de", "ar", "ja", "zh"]
+
+# Clés dont la valeur n'est jamais traduite
+SAFE_KEYS = {"date", "heure"}
+
+# Traductions manuelles prioritaires
+LABELS = {
+    "👶 Enfants": {
+        "en": "👶 Children",
+        "de": "👶 Kinder",
+        "ar": "👶 أطفال",
+        "ja": "👶 子供向け",
+        "zh": "👶 儿童"
+    },
+    "🧑‍🦰 Tous publics": {
+        "en": "🧑‍🦰 All audiences",
+        "de": "🧑‍🦰 Für alle",
+        "ar": "🧑‍🦰 لجميع الفئات",
+        "ja": "🧑‍🦰 全年齢対象",
+        "zh": "🧑‍🦰 适合所有人"
+    }
+}
+
+TRANSLATION_BACKEND = os.getenv("TRANSLATION_BACKEND", "google").strip().lower()
+# Limite de taille d'une requête Google Traduction
+GOOGLE_MAX_CHARS = int(os.getenv("GOOGLE_MAX_CHARS", "4500"))
+
+TRANSLATION_WORKERS = int(os.getenv("TRANSLATION_WORKERS", "4"))
+# Lots en attente ou en cours au-delà desquels on ne soumet plus rien
+TRANSLATION_MAX_PENDING = int(os.getenv("TRANSLATION_MAX_PENDING", "16"))
+TRANSLATION_DEADLINE_S = float(os.getenv("TRANSLATION_DEADLINE_S", "2.5"))
+TRANSLATION_BREAKER_FAILURES = int(os.getenv("TRANSLATION_BREAKER_FAILURES", "3"))
+TRANSLATION_BREAKER_COOLDOWN_S = float(os.getenv("TRANSLATION_BREAKER_COOLDOWN_S", "30"))
+
+
+# ---------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------
+class TranslationBackend:
+    """Interface : traduit une liste de textes français vers `lang`."""
+
+    name = "base"
+
+    def split(self, texts: list[str]) -> list[list[str]]:
+        """Lots envoyés en parallèle (un seul par défaut)."""
+        return [texts]
+
+    def translate_batch(self, texts: list[str], lang: str) -> list[Optional[str]]:
+        """Même ordre que `texts` ; None pour un texte non traduit."""
+        raise NotImplementedError
+
+
+class GoogleBackend(TranslationBackend):
+    """
+    Google Traduction (deep_translator) : les textes sont joints par des
+    retours à la ligne en blocs de GOOGLE_MAX_CHARS, un appel par bloc.
+    Un bloc dont le découpage ne correspond plus est retraduit texte par texte.
+    """
+
+    name = "google"
+    _SEPARATOR = "\n"
+
+    def __init__(self, max_chars: int = GOOGLE_MAX_CHARS):
+        self._max_chars = max_chars
+        self._translators = {}
+
+    def _translator(self, lang: str):
+        if lang not in self._translators:
+            from deep_translator import GoogleTranslator
+            self._translators[lang] = GoogleTranslator(source="fr", target=lang)
+        return self._translators[lang]
+
+    def split(self, texts: list[str]) -> list[list[str]]:
+        # Les textes multi-lignes ne peuvent pas être joints : un lot chacun
+        batches = [[t] for t in texts if self._SEPARATOR in t]
+        chunk, size = [], 0
+        for text in (t for t in texts if self._SEPARATOR not in t):
+            if chunk and size + len(text) + 1 > self._max_chars:
+                batches.append(chunk)
+                chunk, size = [], 0
+            chunk.append(text)
+            size += len(text) + 1
+        if chunk:
+            batches.append(chunk)
+        return batches
+
+    def translate_batch(self, texts: list[str], lang: str) -> list[Optional[str]]:
+        translator = self._translator(lang)
+        if len(texts) == 1:
+            return [translator.translate(texts[0]) or None]
+        parts = (translator.translate(self._SEPARATOR.join(texts)) or "").split(self._SEPARATOR)
+        if len(parts) != len(texts):
+            parts = [translator.translate(t) for t in texts]
+        return [p or None for p in parts]
+
+
+class LocalBackend(TranslationBackend):
+    """
+    Traducteur factice et déterministe : « [en] texte ». Compte les appels ;
+    `delay` et `fail` simulent un fournisseur lent ou en panne.
+    """
+
+    name = "local"
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+
+    def translate_batch(self, texts: list[str], lang: str) -> list[str]:
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("fournisseur de traduction indisponible")
+        return [f"[{lang}] {t}" for t in texts]
+
+
+BACKENDS = {"google": GoogleBackend, "local": LocalBackend}
+_backend: Optional[TranslationBackend] = None
+
+
+def get_backend() -> TranslationBackend:
+    global _backend
+    if _backend is None:
+        _backend = BACKENDS.get(TRANSLATION_BACKEND, GoogleBackend)()
+    return _backend
+
+
+def set_backend(backend: TranslationBackend) -> None:
+    global _backend
+    _backend = backend
+
+
+# ---------------------------------------------------------------------
+# Disjoncteur et pool
+# ---------------------------------------------------------------------
+class CircuitBreaker:
+    """
+    Fermé → ouvert après `failures` échecs consécutifs ; après `cooldown`
+    secondes, semi-ouvert : un seul essai, qui referme ou rouvre le circuit.
+    """
+
+    def __init__(self, failures: int = TRANSLATION_BREAKER_FAILURES,
+                 cooldown: float = TRANSLATION_BREAKER_COOLDOWN_S, clock=time.monotonic):
+        self._threshold = failures
+        self._cooldown = cooldown
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self._cooldown:
+            return "half-open"
+        return "open"
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def release_trial(self) -> None:
+        """Essai accordé mais rien n'a été soumis : un autre appel pourra le tenter."""
+        with self._lock:
+            self._trial = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures, self._opened_at, self._trial = 0, None, False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial or (self._opened_at is None and self._failures >= self._threshold):
+                self._opened_at, self._trial = self._clock(), False
+                print(f"[WARN] Traduction : disjoncteur ouvert après {self._failures} échec(s), "
+                      f"réponses sans traduction automatique pendant {self._cooldown:g} s")
+
+
+BREAKER = CircuitBreaker()
+
+_executor: Optional[ThreadPoolExecutor] = None
+_slots: Optional[threading.BoundedSemaphore] = None
+_executor_pid: Optional[int] = None
+_executor_lock = threading.Lock()
+
+
+def _pool() -> tuple[ThreadPoolExecutor, threading.BoundedSemaphore]:
+    """Pool du processus courant (les threads ne survivent pas au fork)."""
+    global _executor, _slots, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        with _executor_lock:
+            if _executor is None or _executor_pid != os.getpid():
+                _executor = ThreadPoolExecutor(TRANSLATION_WORKERS, thread_name_prefix="translate")
+                _slots = threading.BoundedSemaphore(TRANSLATION_MAX_PENDING)
+                _executor_pid = os.getpid()
+    return _executor, _slots
+
+
+def _run_batch(backend: TranslationBackend, texts: list[str], lang: str,
+               cache: TranslationCache, slots: threading.BoundedSemaphore) -> Optional[dict]:
+    """Traductions du lot, ou None en cas d'échec du backend."""
+    try:
+        results = backend.translate_batch(texts, lang)
+    except Exception as e:
+        print(f"[WARN] Erreur traduction ({lang}) : {e}")
+        return None
+    finally:
+        slots.release()
+    fresh = {src: dst for src, dst in zip(texts, results) if dst}
+    # Un lot arrivé après l'échéance sert quand même les requêtes suivantes
+    cache.put_many(fresh, lang)
+    return fresh
+
+
+def translate_missing(texts: list[str], lang: str, backend: Optional[TranslationBackend] = None,
+                      cache: TranslationCache = TRANSLATIONS, breaker: Optional[CircuitBreaker] = None,
+                      deadline: Optional[float] = None) -> dict[str, str]:
+    """Traductions obtenues avant l'échéance ; {} si le disjoncteur est ouvert."""
+    breaker = breaker or BREAKER
+    if not texts or not breaker.allow():
+        return {}
+    if deadline is None:
+        deadline = TRANSLATION_DEADLINE_S
+    backend = backend or get_backend()
+    executor, slots = _pool()
+    futures = []
+    for batch in backend.split(texts):
+        if not slots.acquire(blocking=False):
+            break   # pool saturé : le reste est servi en français
+        futures.append(executor.submit(_run_batch, backend, batch, lang, cache, slots))
+    if not futures:
+        # Sans lot soumis, aucun verdict ne viendrait libérer l'essai semi-ouvert
+        breaker.release_trial()
+        return {}
+    done, late = wait(futures, timeout=deadline)
+    if late:
+        print(f"[WARN] Traduction ({lang}) : {len(late)} lot(s) hors délai ({deadline:.1f} s)")
+    translations, failed = {}, bool(late)
+    for future in done:
+        result = future.result()
+        failed |= result is None
+        translations.update(result or {})
+    # Un verdict par requête : hors délai ou en erreur compte comme un échec
+    if failed:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return translations
+
+
+# ---------------------------------------------------------------------
+# Parcours de l'arbre
+# ---------------------------------------------------------------------
+def _translatable(text: str, lang: str) -> bool:
+    return bool(text.strip()) and not (text in LABELS and lang in LABELS[text])
+
+
+def collect_leaves(value: Any, lang: str, out: Optional[dict] = None) -> list[str]:
+    """Chaînes uniques à traduire, dans l'ordre de première apparition."""
+    if out is None:
+        out = {}
+    if isinstance(value, str):
+        if _translatable(value, lang):
+            out[value] = None
+    elif isinstance(value, list):
+        for v in value:
+            collect_leaves(v, lang, out)
+    elif isinstance(value, dict):
+        for k, v in value.items():
+            if k not in SAFE_KEYS:
+                collect_leaves(v, lang, out)
+    return list(out)
+
+
+def rebuild(value: Any, lang: str, translations: dict[str, str]) -> Any:
+    if isinstance(value, str):
+        if value in LABELS and lang in LABELS[value]:
+            return LABELS[value][lang]
+        return translations.get(value, value)
+    if isinstance(value, list):
+        return [rebuild(v, lang, translations) for v in value]
+    if isinstance(value, dict):
+        return {k: (v if k in SAFE_KEYS else rebuild(v, lang, translations))
+                for k, v in value.items()}
+    return value
+
+
+class TranslationReport:
+    """Feuilles restées en français pendant un bloc `track_translation()`."""
+
+    def __init__(self):
+        self.untranslated = 0
+
+    @property
+    def complete(self) -> bool:
+        return self.untranslated == 0
+
+
+_reports = threading.local()
+
+
+@contextmanager
+def track_translation() -> Iterator[TranslationReport]:
+    """Compte les feuilles non traduites par translate_tree dans ce thread."""
+    report = TranslationReport()
+    stack = _reports.__dict__.setdefault("stack", [])
+    stack.append(report)
+    try:
+        yield report
+    finally:
+        stack.remove(report)
+
+
+def translate_tree(value: Any, lang: str = "fr", backend: Optional[TranslationBackend] = None,
+                   cache: TranslationCache = TRANSLATIONS) -> Any:
+    if lang == "fr" or lang not in SUPPORTED_LANGS:
+        return value
+    from logic.catalog import CATALOG
+
+    leaves = collect_leaves(value, lang)
+    # Textes statiques : catalogue compilé (si activé), puis cache, puis backend
+    translations = CATALOG.lookup_many(leaves, lang) if CATALOG else {}
+    pending = [t for t in leaves if t not in translations]
+    if pending:
+        translations.update(cache.get_many(pending, lang))
+    missing = [t for t in pending if t not in translations]
+    if missing:
+        # Les feuilles non traduites à temps restent en français
+        translations.update(translate_missing(missing, lang, backend, cache))
+        untranslated = sum(1 for t in missing if t not in translations)
+        for report in getattr(_reports, "stack", ()):
+            report.untranslated += untranslated
+    return rebuild(value, lang, translations)
@@ -12,11 +12,19 @@ import json
 import joblib
 import numpy as np
 from pathlib import Path
-from typing import Optional
+from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import accuracy_score
 from sentence_transformers import SentenceTransformer
+from model_registry import ModelBundle, ModelRegistry
+from intent_batcher import batcher_from_env
+from embedding_cache import cache_from_env
+from pattern_index import PatternIndex
+from linear_softmax import top_k as _top_k
+from embedding_store import STORE_FILE, PatternEmbeddingStore, pattern_key
+import keyword_matcher
+from text_normalizer import clean_for_model, normalize_question
 
 # ------------------------
 # Réduction des logs TensorFlow
@@ -27,59 +35,73 @@ DEFAULT_MODEL_DIR = Path("intents_model")
 DEFAULT_MODEL_DIR.mkdir(parents=True, exist_ok=True)
 
 _DEFAULT_ENCODER_NAME = "paraphrase-multilingual-MiniLM-L12-v2"
-_ENCODER_CACHE: Optional[SentenceTransformer] = None
+
+# Patterns d'entraînement (table exacte construite au chargement du bundle)
+INTENTS_DATA_PATH = Path(os.getenv("INTENTS_DATA_PATH", Path(__file__).resolve().parent / "intents_data.json"))
+
+# Renforcements : indices clairs qui imposent l'intention (ordre = priorité)
+INTENT_BOOSTS = [
+    ("get_programme_07_mai", ["7 mai", "dernier jour", "clôture"]),
+    ("get_programme_28_avril", ["28 avril", "premier jour", "ouverture"]),
+]
+keyword_matcher.register("boost", INTENT_BOOSTS)
+
+# Cascade : le premier étage TF-IDF répond seul au-dessus de ce seuil de confiance
+CASCADE_THRESHOLD = float(os.getenv("INTENTS_CASCADE_THRESHOLD", "0.8"))
+
+# Backend d'inférence de l'encodeur : torch | onnx | onnx-int8 (cf. onnx_encoder.py)
+ENCODER_BACKEND = os.getenv("INTENTS_ENCODER_BACKEND", "torch").strip().lower()
+_ENCODER_CACHE: dict[str, SentenceTransformer] = {}
 
 
 # ---------------------------------------------------------------------
 def _get_encoder(model_name: str = _DEFAULT_ENCODER_NAME) -> SentenceTransformer:
-    global _ENCODER_CACHE
-    if _ENCODER_CACHE is None:
-        _ENCODER_CACHE = SentenceTransformer(model_name)
-    return _ENCODER_CACHE
+    encoder = _ENCODER_CACHE.get(model_name)
+    if encoder is None:
+        encoder = _ENCODER_CACHE[model_name] = SentenceTransformer(model_name)
+    return encoder
+
+
+def _load_encoder(model_name: str, model_dir: Path):
+    """Encodeur du bundle selon ENCODER_BACKEND ; repli sur torch si l'export ONNX manque."""
+    if ENCODER_BACKEND in ("onnx", "onnx-int8"):
+        try:
+            from onnx_encoder import load_onnx_encoder
+            return load_onnx_encoder(model_dir, model_name, quantized=ENCODER_BACKEND == "onnx-int8")
+        except Exception as e:
+            print(f"[WARN] Backend {ENCODER_BACKEND} indisponible ({e}) → torch")
+    return _get_encoder(model_name)
+
+
+def _load_pattern_index() -> PatternIndex | None:
+    if not INTENTS_DATA_PATH.exists():
+        return None
+    return PatternIndex.from_json(INTENTS_DATA_PATH, clean_text)
+
+
+# Registre process-wide : bundle chargé une fois, rechargé à chaud si les fichiers changent
+_REGISTRY = ModelRegistry(encoder_factory=_load_encoder,
+                          index_factory=_load_pattern_index,
+                          extra_files=(INTENTS_DATA_PATH,))
+
+
+def get_model_bundle(model_dir: str | Path = DEFAULT_MODEL_DIR) -> ModelBundle:
+    """Retourne le bundle (encodeur, classifier, label encoder) à jour pour model_dir."""
+    return _REGISTRY.get(model_dir)
+
+
+def _atomic_dump(obj, path: Path) -> None:
+    """Écrit via un fichier temporaire puis os.replace (jamais de fichier partiel lu)."""
+    tmp = path.with_name(path.name + ".tmp")
+    joblib.dump(obj, tmp)
+    os.replace(tmp, path)
 
 
 def clean_text(s: str) -> str:
-    """Nettoyage et normalisation des textes pour le modèle."""
+    """Nettoyage et normalisation des textes pour le modèle (cf. text_normalizer)."""
     if not isinstance(s, str):
         s = str(s or "")
-    s = s.lower()
-    s = re.sub(r"[^a-zàâçéèêëîïôûùüÿñæœ0-9\s]", " ", s)
-
-    replacements = {
-        "sessions": "programme",
-        "planning": "programme",
-        "événements": "programme",
-        "événement": "programme",
-        "agenda": "programme",
-        "plan": "programme",
-        "activité": "programme",
-        "activités": "programme",
-        "seances": "programme",
-        "event": "événement",
-        "journee": "jour",
-        "journée": "jour",
-        "journées": "jours",
-        "date": "jour",
-        "details": "détail",
-        "détails": "détail",
-        "participants": "visiteurs",
-        "intervenants": "orateurs",
-        "conférenciers": "orateurs",
-        "stands": "exposants",
-        "expositions": "exposants",
-        "localisation": "pays",
-        "emplacement": "stands",
-        "origine": "pays",
-        "fermeture": "fin",
-        "clôture": "fin",
-        "ouverture": "début",
-        "lancement": "début",
-        "inauguration": "début",
-    }
-
-    for k, v in replacements.items():
-        s = s.replace(k, v)
-    return re.sub(r"\s+", " ", s).strip()
+    return clean_for_model(s)
 
 
 # ---------------------------------------------------------------------
@@ -105,8 +127,18 @@ def train_and_save(json_path: str | Path,
 
     print(f"📚 {len(texts)} exemples — {len(set(intents))} intentions.")
 
-    encoder = SentenceTransformer(model_name)
-    X = encoder.encode(texts, convert_to_numpy=True)
+    # Embeddings : seuls les patterns nouveaux ou modifiés passent par l'encodeur
+    store_path = model_dir / STORE_FILE
+    store = PatternEmbeddingStore.load(store_path)
+    keys = [pattern_key(model_name, t) for t in texts]
+    todo = list(dict.fromkeys(k for k in keys if k not in store))
+    if todo:
+        by_key = dict(zip(keys, texts))
+        encoder = _get_encoder(model_name)
+        store.update(todo, encoder.encode([by_key[k] for k in todo], convert_to_numpy=True))
+    print(f"🧮 {len(todo)} pattern(s) encodé(s), {len(set(keys)) - len(todo)} repris du cache.")
+    store.save(store_path, keep=set(keys))
+    X = np.vstack([store.get(k) for k in keys])
 
     label_enc = LabelEncoder()
     y = label_enc.fit_transform(intents)
@@ -117,51 +149,215 @@ def train_and_save(json_path: str | Path,
     acc = accuracy_score(y, clf.predict(X))
     print(f"✅ Entraînement terminé — accuracy = {acc:.3f}")
 
-    joblib.dump(clf, model_dir / "classifier.joblib")
-    joblib.dump(label_enc, model_dir / "label_encoder.joblib")
+    # Premier étage de la cascade : TF-IDF creux + modèle linéaire.
+    # On réutilise le vectorizer existant (partagé avec debug_intent.py / model.keras).
+    vec_path = model_dir / "vectorizer.joblib"
+    if vec_path.exists():
+        vectorizer = joblib.load(vec_path)
+    else:
+        vectorizer = TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True).fit(texts)
+        _atomic_dump(vectorizer, vec_path)
+    X_tfidf = vectorizer.transform(texts)
+    tfidf_clf = LogisticRegression(max_iter=3000, C=10.0)
+    tfidf_clf.fit(X_tfidf, y)
+    tfidf_acc = accuracy_score(y, tfidf_clf.predict(X_tfidf))
+    print(f"⚡ Étage TF-IDF — accuracy = {tfidf_acc:.3f}")
+
+    _atomic_dump(clf, model_dir / "classifier.joblib")
+    _atomic_dump(label_enc, model_dir / "label_encoder.joblib")
+    _atomic_dump(tfidf_clf, model_dir / "tfidf_classifier.joblib")
     (model_dir / "model_name.txt").write_text(model_name, encoding="utf-8")
+    _REGISTRY.invalidate(model_dir)
     print(f"💾 Modèle sauvegardé dans {model_dir.resolve()}")
 
-    return {"accuracy": acc, "samples": len(texts)}
+    return {"accuracy": acc, "tfidf_accuracy": tfidf_acc, "samples": len(texts)}
 
 
 # ---------------------------------------------------------------------
+def _detect_mode(text: str) -> str:
+    try:
+        from mode_detector import detect_mode
+        return detect_mode(text)
+    except Exception:
+        return "breve" if len(text.split()) < 7 else "detaille"
+
+
+def _empty_result() -> dict:
+    """Texte vide : mêmes clés que les autres résultats, pour les deux points d'entrée."""
+    return {"intent": "unknown", "confidence": 0.0, "mode": "unknown", "answer": "Texte vide.",
+            "tier": "empty", "margin": 0.0, "alternatives": []}
+
+
+def _pattern_result(text: str, cleaned: str, bundle: ModelBundle) -> dict | None:
+    """Question identique (ou quasi) à un pattern connu → confiance 1.0, aucun modèle."""
+    if bundle.pattern_index is None:
+        return None
+    intent = bundle.pattern_index.lookup(text, cleaned)
+    if intent is None:
+        return None
+    return {"intent": intent, "confidence": 1.0, "mode": _detect_mode(text),
+            "answer": None, "tier": "pattern", "margin": 1.0,
+            "alternatives": [{"intent": intent, "confidence": 1.0}]}
+
+
+def _build_result(text: str, probs: np.ndarray, label_enc, top_k: int = 3,
+                  tier: str = "encoder") -> dict:
+    """Post-traitement commun (mode, renforcements, seuil) d'une ligne de probabilités."""
+    best, margin = _top_k(probs, top_k)
+    labels = label_enc.classes_
+    idx = int(best[0])
+    intent = str(labels[idx])
+    conf = float(probs[idx])
+    mode = _detect_mode(text)
+
+    # Renforcement si indices clairs (même passage Aho–Corasick que la détection de mode)
+    boosted = keyword_matcher.first_match(text, "boost")
+    if boosted:
+        intent, conf = boosted, max(conf, 0.8)
+
+    if conf < 0.25:
+        result = {"intent": "unknown", "confidence": conf, "mode": mode, "answer": "Pouvez-vous reformuler votre question ?"}
+    else:
+        result = {"intent": intent, "confidence": conf, "mode": mode, "answer": None}
+    result["tier"] = tier
+    # Marge top1 − top2 : permet à l'appelant de demander une précision sans rappeler le modèle
+    result["margin"] = margin
+    result["alternatives"] = [
+        {"intent": str(labels[i]), "confidence": float(probs[i])} for i in best
+    ]
+    return result
+
+
+# Cache LRU des embeddings (clé : encodeur/backend + texte nettoyé)
+_EMBED_CACHE = cache_from_env()
+
+
+def embedding_cache_stats() -> dict:
+    """Compteurs hits / misses du cache d'embeddings."""
+    return _EMBED_CACHE.stats()
+
+
+def _encode(bundle: ModelBundle, cleaned: list[str], batch_size: int = 32) -> np.ndarray:
+    """Encode via le cache : seules les questions inconnues passent par le transformer."""
+    rows = [_EMBED_CACHE.get((bundle.encoder_key, t)) for t in cleaned]
+    missing = [i for i, r in enumerate(rows) if r is None]
+    if missing:
+        # Doublons dans le lot : un seul passage par texte distinct
+        uniq = list(dict.fromkeys(cleaned[i] for i in missing))
+        vecs = bundle.encoder.encode(uniq, batch_size=batch_size, convert_to_numpy=True)
+        fresh = dict(zip(uniq, vecs))
+        for t, v in fresh.items():
+            _EMBED_CACHE.put((bundle.encoder_key, t), v)
+        for i in missing:
+            rows[i] = fresh[cleaned[i]]
+    return np.vstack(rows).astype(np.float32, copy=False)
+
+
+def _score_tfidf(bundle: ModelBundle, cleaned: list[str]) -> np.ndarray | None:
+    """Premier étage (TF-IDF + linéaire) : quelques microsecondes, None si absent."""
+    if bundle.tfidf_scorer is None:
+        return None
+    return bundle.tfidf_scorer.predict_proba(bundle.tfidf_vectorizer.transform(cleaned))
+
+
+def _score(cleaned: list[str], model_dir: str | Path = DEFAULT_MODEL_DIR,
+           batch_size: int = 32) -> tuple[np.ndarray, ModelBundle]:
+    """Un encode + un predict_proba pour une liste de textes déjà nettoyés."""
+    bundle = get_model_bundle(model_dir)
+    X = _encode(bundle, cleaned, batch_size=batch_size)
+    return bundle.scorer.predict_proba(X), bundle
+
+
+def _score_coalesced(items: list[tuple[str, str]]) -> list[tuple[np.ndarray, ModelBundle]]:
+    """Fonction de lot du micro-batcher : items = [(model_dir, texte nettoyé)]."""
+    results: list = [None] * len(items)
+    groups: dict[str, list[int]] = {}
+    for i, (model_dir, _) in enumerate(items):
+        groups.setdefault(model_dir, []).append(i)
+    for model_dir, idxs in groups.items():
+        probs, bundle = _score([items[i][1] for i in idxs], model_dir, batch_size=len(idxs))
+        for row, i in enumerate(idxs):
+            results[i] = (probs[row], bundle)
+    return results
+
+
+# Micro-batching inter-requêtes (désactivé par défaut, cf. INTENTS_BATCH_WINDOW_MS)
+_BATCHER = batcher_from_env(_score_coalesced)
+
+
 def predict_intent(text: str, model_dir: str | Path = DEFAULT_MODEL_DIR) -> dict:
     """Prédit l’intention principale d’un texte utilisateur."""
     text = (text or "").strip()
     if not text:
-        return {"intent": "unknown", "confidence": 0.0, "mode": "unknown", "answer": "Texte vide."}
+        return _empty_result()
 
-    model_dir = Path(model_dir)
-    if not (model_dir / "classifier.joblib").exists():
-        raise FileNotFoundError("⚠️ Classifier non trouvé. Lancez d’abord l’entraînement.")
-
-    model_name = (model_dir / "model_name.txt").read_text(encoding="utf-8").strip()
-    encoder = _get_encoder(model_name)
-    clf = joblib.load(model_dir / "classifier.joblib")
-    label_enc = joblib.load(model_dir / "label_encoder.joblib")
-
-    X = encoder.encode([clean_text(text)], convert_to_numpy=True)
-    probs = clf.predict_proba(X)[0]
-    idx = int(np.argmax(probs))
-    intent = label_enc.inverse_transform([idx])[0]
-    conf = float(probs[idx])
+    cleaned = normalize_question(text).cleaned
+    bundle = get_model_bundle(model_dir)
 
-    # Détection du mode
-    try:
-        from mode_detector import detect_mode
-        mode = detect_mode(text)
-    except Exception:
-        mode = "breve" if len(text.split()) < 7 else "detaille"
+    # Étage 0 : pattern d'entraînement copié tel quel
+    hit = _pattern_result(text, cleaned, bundle)
+    if hit is not None:
+        return hit
 
-    # Renforcement si indices clairs
-    low = text.lower()
-    if any(k in low for k in ["7 mai", "dernier jour", "clôture"]):
-        intent, conf = "get_programme_07_mai", max(conf, 0.8)
-    elif any(k in low for k in ["28 avril", "premier jour", "ouverture"]):
-        intent, conf = "get_programme_28_avril", max(conf, 0.8)
+    # Étage 1 : TF-IDF, suffisant pour les questions formulaïques
+    probs = _score_tfidf(bundle, [cleaned])
+    if probs is not None and probs[0].max() >= CASCADE_THRESHOLD:
+        return _build_result(text, probs[0], bundle.label_encoder, tier="tfidf")
 
-    if conf < 0.25:
-        return {"intent": "unknown", "confidence": conf, "mode": mode, "answer": "Pouvez-vous reformuler votre question ?"}
+    # Étage 2 : sentence-transformer pour les questions ambiguës
+    if _BATCHER is not None:
+        probs, bundle = _BATCHER((str(model_dir), cleaned))
+    else:
+        # Une seule ligne : softmax dans le buffer préalloué du thread
+        probs = bundle.scorer.predict_proba_row(_encode(bundle, [cleaned])[0])
+    return _build_result(text, probs, bundle.label_encoder, tier="encoder")
+
+
+def predict_intents(texts: list[str],
+                    model_dir: str | Path = DEFAULT_MODEL_DIR,
+                    top_k: int = 3,
+                    batch_size: int = 64) -> list[dict]:
+    """
+    Version batch de predict_intent : un seul encode + un seul predict_proba
+    pour toute la liste (évaluations hors-ligne, rejeu des bornes).
+    Retourne, dans l'ordre, intent / confidence / mode / tier / alternatives (top-k).
+    """
+    texts = [(t or "").strip() for t in texts]
+    results: list[dict | None] = [None] * len(texts)
+
+    idx_valid = [i for i, t in enumerate(texts) if t]
+    for i, t in enumerate(texts):
+        if not t:
+            results[i] = _empty_result()
+
+    if idx_valid:
+        cleaned = {i: clean_text(texts[i]) for i in idx_valid}
+        bundle = get_model_bundle(model_dir)
+
+        remaining = []
+        for i in idx_valid:
+            hit = _pattern_result(texts[i], cleaned[i], bundle)
+            if hit is not None:
+                results[i] = hit
+            else:
+                remaining.append(i)
+
+        # Étage 1 sur toute la matrice, escalade des seules lignes ambiguës
+        escalate = remaining
+        tfidf_probs = _score_tfidf(bundle, [cleaned[i] for i in remaining]) if remaining else None
+        if tfidf_probs is not None:
+            escalate = []
+            for row, i in enumerate(remaining):
+                if tfidf_probs[row].max() >= CASCADE_THRESHOLD:
+                    results[i] = _build_result(texts[i], tfidf_probs[row], bundle.label_encoder,
+                                               top_k=top_k, tier="tfidf")
+                else:
+                    escalate.append(i)
+
+        if escalate:
+            probs, bundle = _score([cleaned[i] for i in escalate], model_dir, batch_size=batch_size)
+            for row, i in enumerate(escalate):
+                results[i] = _build_result(texts[i], probs[row], bundle.label_encoder,
+                                           top_k=top_k, tier="encoder")
 
-    return {"intent": intent, "confidence": conf, "mode": mode, "answer": None}
+    return results
@@ -0,0 +1,151 @@
+"""
+model_registry.py
+Registre process-wide des modèles d'intentions.
+- Charge encodeur + classifier + label encoder une seule fois (bundle immuable)
+- Surveille les mtimes des fichiers de intents_model/ et recharge à chaud
+  (swap atomique) après un nouvel entraînement, sans redémarrage.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+import joblib
+
+from linear_softmax import LinearSoftmax
+
+# Fichiers dont la modification déclenche un rechargement
+WATCHED_FILES = ("model_name.txt", "classifier.joblib", "label_encoder.joblib")
+# Premier étage de la cascade (TF-IDF + modèle linéaire) — facultatif
+OPTIONAL_FILES = ("vectorizer.joblib", "tfidf_classifier.joblib")
+
+# Intervalle minimal (secondes) entre deux vérifications des mtimes
+RELOAD_CHECK_INTERVAL = float(os.getenv("INTENTS_RELOAD_INTERVAL", "2.0"))
+
+
+@dataclass(frozen=True)
+class ModelBundle:
+    """Ensemble cohérent et immuable des objets nécessaires à la prédiction."""
+    model_dir: Path
+    model_name: str
+    encoder: Any
+    classifier: Any
+    label_encoder: Any
+    version: Tuple
+    tfidf_vectorizer: Any = None
+    tfidf_classifier: Any = None
+    pattern_index: Any = None
+    # Inférence NumPy (coef_/intercept_ extraits une fois) des deux classifiers
+    scorer: Any = None
+    tfidf_scorer: Any = None
+
+    @property
+    def encoder_key(self) -> str:
+        """Identifie l'espace d'embedding (modèle + backend d'inférence)."""
+        return f"{self.model_name}:{getattr(self.encoder, 'backend', 'torch')}"
+
+
+def read_version(model_dir: Path, extra_files: Tuple[Path, ...] = ()) -> Tuple:
+    """Empreinte (nom, mtime, taille) des fichiers surveillés."""
+    if not (model_dir / "classifier.joblib").exists():
+        raise FileNotFoundError("⚠️ Classifier non trouvé. Lancez d’abord l’entraînement.")
+    version = []
+    for name in WATCHED_FILES:
+        st = (model_dir / name).stat()
+        version.append((name, st.st_mtime_ns, st.st_size))
+    for path in [model_dir / name for name in OPTIONAL_FILES] + list(extra_files):
+        if path.exists():
+            st = path.stat()
+            version.append((str(path), st.st_mtime_ns, st.st_size))
+    return tuple(version)
+
+
+class ModelRegistry:
+    """
+    Cache des bundles par dossier de modèle.
+    Le chemin chaud (bundle à jour) ne prend aucun verrou ; un seul thread
+    recharge pendant que les autres continuent de servir l'ancien bundle.
+    """
+
+    def __init__(self, encoder_factory: Callable[[str, Path], Any],
+                 check_interval: float = RELOAD_CHECK_INTERVAL,
+                 index_factory: Callable[[], Any] | None = None,
+                 extra_files: Tuple[Path, ...] = ()):
+        self._encoder_factory = encoder_factory
+        self._index_factory = index_factory
+        self._extra_files = tuple(Path(p) for p in extra_files)
+        self._check_interval = check_interval
+        self._bundles: Dict[Path, ModelBundle] = {}
+        self._next_check: Dict[Path, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model_dir: str | Path) -> ModelBundle:
+        key = Path(model_dir).resolve()
+        bundle = self._bundles.get(key)
+        if bundle is not None and time.monotonic() < self._next_check.get(key, 0.0):
+            return bundle
+
+        # Rechargement déjà en cours dans un autre thread → on sert l'ancien bundle
+        if not self._lock.acquire(blocking=bundle is None):
+            return bundle
+        try:
+            bundle = self._bundles.get(key)
+            now = time.monotonic()
+            if bundle is not None and now < self._next_check.get(key, 0.0):
+                return bundle
+
+            try:
+                version = read_version(key, self._extra_files)
+                if bundle is None or bundle.version != version:
+                    bundle = self._load(key, version)
+                    self._bundles[key] = bundle
+                    print(f"🔄 Modèle d’intentions chargé depuis {key}")
+            except Exception as e:
+                if bundle is None:
+                    raise
+                # Fichiers en cours d'écriture ou de remplacement : on garde l'ancien bundle
+                print(f"[WARN] Rechargement du modèle ignoré : {e}")
+            self._next_check[key] = now + self._check_interval
+            return bundle
+        finally:
+            self._lock.release()
+
+    def invalidate(self, model_dir: str | Path | None = None) -> None:
+        """Force une nouvelle vérification au prochain appel."""
+        with self._lock:
+            if model_dir is None:
+                self._next_check.clear()
+            else:
+                self._next_check.pop(Path(model_dir).resolve(), None)
+
+    def _load(self, model_dir: Path, version: Tuple) -> ModelBundle:
+        model_name = (model_dir / "model_name.txt").read_text(encoding="utf-8").strip()
+        classifier = joblib.load(model_dir / "classifier.joblib")
+        label_encoder = joblib.load(model_dir / "label_encoder.joblib")
+        if len(classifier.classes_) != len(label_encoder.classes_):
+            raise ValueError("classifier et label encoder incohérents (entraînement en cours ?)")
+
+        tfidf_vectorizer = tfidf_classifier = None
+        if all((model_dir / name).exists() for name in OPTIONAL_FILES):
+            tfidf_vectorizer = joblib.load(model_dir / "vectorizer.joblib")
+            tfidf_classifier = joblib.load(model_dir / "tfidf_classifier.joblib")
+            if len(tfidf_classifier.classes_) != len(label_encoder.classes_):
+                print("[WARN] tfidf_classifier obsolète → cascade TF-IDF désactivée")
+                tfidf_vectorizer = tfidf_classifier = None
+
+        return ModelBundle(
+            model_dir=model_dir,
+            model_name=model_name,
+            encoder=self._encoder_factory(model_name, model_dir),
+            classifier=classifier,
+            label_encoder=label_encoder,
+            version=version,
+            tfidf_vectorizer=tfidf_vectorizer,
+            tfidf_classifier=tfidf_classifier,
+            pattern_index=self._index_factory() if self._index_factory else None,
+            scorer=LinearSoftmax.from_sklearn(classifier),
+            tfidf_scorer=LinearSoftmax.from_sklearn(tfidf_classifier) if tfidf_classifier is not None else None,
+        )
@@ -6,7 +6,7 @@ Combine regex rapides + fallback NLP (spaCy / Transformers / LLM).
 """
 
 import re
-import unicodedata
+from text_normalizer import normalize_for_matching
 from text_corrector import corriger_texte
 from faq_retrieval import traiter_question as faq_traiter
 
@@ -18,13 +18,7 @@ def nettoyer_texte(text: str) -> str:
     """
     Nettoie le texte : minuscule, suppression des accents et ponctuations.
     """
-    text = text.lower()
-    text = ''.join(
-        c for c in unicodedata.normalize('NFD', text)
-        if unicodedata.category(c) != 'Mn'
-    )
-    text = re.sub(r"[?.!,:;]", "", text)
-    return text.strip()
+    return normalize_for_matching(text)
 
 
 # ──────────────
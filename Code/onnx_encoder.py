@@ -0,0 +1,216 @@
+"""
+onnx_encoder.py
+Backend d'inférence CPU alternatif pour l'encodeur d'intentions :
+graphe ONNX exporté depuis le SentenceTransformer, optionnellement quantifié
+en int8 (quantification dynamique onnxruntime).
+
+Usage :
+    python onnx_encoder.py export [chemin]  # exporte intents_model/onnx/ (fp32 + int8)
+    python onnx_encoder.py parity           # vérifie l'accord avec le backend torch
+
+Sélection à l'exécution : INTENTS_ENCODER_BACKEND = torch | onnx | onnx-int8
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ONNX_SUBDIR = "onnx"
+FP32_FILE = "model.onnx"
+INT8_FILE = "model.int8.onnx"
+CONFIG_FILE = "onnx_config.json"
+
+
+# ---------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------
+def export_onnx(model_name_or_path: str, out_dir: str | Path, quantize: bool = True,
+                model_name: str | None = None) -> Path:
+    """
+    Exporte le transformer du SentenceTransformer en ONNX (axes batch/séquence
+    dynamiques) + tokenizer + config de pooling ; ajoute la variante int8.
+    model_name : nom enregistré dans la config et comparé à model_name.txt au
+    chargement (par défaut model_name_or_path, à préciser pour un chemin local).
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from sentence_transformers.models import Normalize, Pooling
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    st = SentenceTransformer(model_name_or_path, device="cpu")
+    transformer = st[0]
+    model = transformer.auto_model.eval()
+    tokenizer = transformer.tokenizer
+
+    pooling = next((m for m in st if isinstance(m, Pooling)), None)
+    if pooling is not None and pooling.get_pooling_mode_str() != "mean":
+        raise ValueError(f"Pooling non supporté : {pooling.get_pooling_mode_str()}")
+
+    sample = tokenizer(["Quand commence la foire ?"], return_tensors="pt")
+    input_names = [n for n in ("input_ids", "attention_mask", "token_type_ids") if n in sample]
+
+    class _LastHiddenState(torch.nn.Module):
+        def __init__(self, m):
+            super().__init__()
+            self.m = m
+
+        def forward(self, *inputs):
+            return self.m(**dict(zip(input_names, inputs)))[0]
+
+    dynamic = {n: {0: "batch", 1: "sequence"} for n in input_names}
+    dynamic["last_hidden_state"] = {0: "batch", 1: "sequence"}
+    fp32_path = out_dir / FP32_FILE
+    with torch.no_grad():
+        torch.onnx.export(
+            _LastHiddenState(model),
+            tuple(sample[n] for n in input_names),
+            str(fp32_path),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic,
+            opset_version=14,
+        )
+
+    tokenizer.save_pretrained(str(out_dir))
+    config = {
+        "model_name": model_name or str(model_name_or_path),
+        "source": str(model_name_or_path),
+        "max_seq_length": int(st.max_seq_length or 256),
+        "normalize": any(isinstance(m, Normalize) for m in st),
+        "pad_token": tokenizer.pad_token,
+        "pad_token_id": int(tokenizer.pad_token_id or 0),
+    }
+    (out_dir / CONFIG_FILE).write_text(json.dumps(config, indent=2), encoding="utf-8")
+    print(f"💾 Export ONNX : {fp32_path}")
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(str(fp32_path), str(out_dir / INT8_FILE), weight_type=QuantType.QInt8)
+        print(f"💾 Variante int8 : {out_dir / INT8_FILE}")
+
+    return out_dir
+
+
+# ---------------------------------------------------------------------
+# Inférence
+# ---------------------------------------------------------------------
+class OnnxSentenceEncoder:
+    """
+    Remplaçant de SentenceTransformer.encode pour le CPU :
+    tokenizers (Rust) + onnxruntime + mean pooling (+ normalisation L2).
+    """
+
+    def __init__(self, onnx_dir: str | Path, quantized: bool = False):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        onnx_dir = Path(onnx_dir)
+        self.config = json.loads((onnx_dir / CONFIG_FILE).read_text(encoding="utf-8"))
+        self.model_name = self.config["model_name"]
+        self.backend = "onnx-int8" if quantized else "onnx"
+
+        self._tokenizer = Tokenizer.from_file(str(onnx_dir / "tokenizer.json"))
+        self._tokenizer.enable_truncation(max_length=self.config["max_seq_length"])
+        self._tokenizer.enable_padding(pad_id=self.config["pad_token_id"],
+                                       pad_token=self.config["pad_token"])
+
+        opts = ort.SessionOptions()
+        # Un worker gunicorn = un process : on évite la sur-souscription des cœurs
+        opts.intra_op_num_threads = int(os.getenv("ONNX_INTRA_OP_THREADS", "1"))
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        path = onnx_dir / (INT8_FILE if quantized else FP32_FILE)
+        self._session = ort.InferenceSession(str(path), opts, providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in self._session.get_inputs()}
+
+    def encode(self, sentences, batch_size: int = 32, convert_to_numpy: bool = True, **_):
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+        chunks = [self._encode_batch(sentences[i:i + batch_size])
+                  for i in range(0, len(sentences), max(batch_size, 1))]
+        out = np.vstack(chunks) if chunks else np.zeros((0, 0), dtype=np.float32)
+        return out[0] if single else out
+
+    def _encode_batch(self, sentences: list[str]) -> np.ndarray:
+        encodings = self._tokenizer.encode_batch(list(sentences))
+        mask = np.asarray([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {
+            "input_ids": np.asarray([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": mask,
+            "token_type_ids": np.asarray([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        feeds = {k: v for k, v in feeds.items() if k in self._input_names}
+        hidden = self._session.run(None, feeds)[0]
+
+        # Mean pooling sur les tokens réels
+        m = mask[..., None].astype(np.float32)
+        emb = (hidden * m).sum(axis=1) / np.clip(m.sum(axis=1), 1e-9, None)
+        if self.config.get("normalize"):
+            emb /= np.clip(np.linalg.norm(emb, axis=1, keepdims=True), 1e-12, None)
+        return emb.astype(np.float32, copy=False)
+
+
+def load_onnx_encoder(model_dir: str | Path, model_name: str, quantized: bool = False) -> OnnxSentenceEncoder:
+    """Charge l'export de model_dir/onnx après avoir vérifié qu'il correspond à model_name."""
+    onnx_dir = Path(model_dir) / ONNX_SUBDIR
+    encoder = OnnxSentenceEncoder(onnx_dir, quantized=quantized)
+    if encoder.model_name != model_name:
+        raise ValueError(f"Export ONNX obsolète ({encoder.model_name} ≠ {model_name}) — relancez l'export.")
+    return encoder
+
+
+# ---------------------------------------------------------------------
+# Parité avec le backend torch
+# ---------------------------------------------------------------------
+def check_parity(texts: list[str], model_dir: str | Path, quantized: bool = True,
+                 min_agreement: float = 0.98, max_confidence_drift: float = 0.05) -> dict:
+    """
+    Compare les prédictions torch vs ONNX sur texts.
+    Lève AssertionError si l'accord des labels ou la dérive de confiance
+    sortent de la tolérance.
+    """
+    import joblib
+    from model_intents import _get_encoder, clean_text
+
+    model_dir = Path(model_dir)
+    model_name = (model_dir / "model_name.txt").read_text(encoding="utf-8").strip()
+    clf = joblib.load(model_dir / "classifier.joblib")
+    cleaned = [clean_text(t) for t in texts]
+
+    p_torch = clf.predict_proba(_get_encoder(model_name).encode(cleaned, convert_to_numpy=True))
+    p_onnx = clf.predict_proba(load_onnx_encoder(model_dir, model_name, quantized).encode(cleaned))
+
+    best = p_torch.argmax(axis=1)
+    agreement = float((best == p_onnx.argmax(axis=1)).mean())
+    rows = np.arange(len(best))
+    drift = float(np.abs(p_torch[rows, best] - p_onnx[rows, best]).max()) if len(best) else 0.0
+
+    report = {"samples": len(texts), "agreement": agreement, "max_confidence_drift": drift,
+              "backend": "onnx-int8" if quantized else "onnx"}
+    print(f"🔎 Parité {report['backend']} : accord={agreement:.3f}, dérive max={drift:.3f}")
+    assert agreement >= min_agreement, f"Accord des labels insuffisant : {agreement:.3f} < {min_agreement}"
+    assert drift <= max_confidence_drift, f"Dérive de confiance trop forte : {drift:.3f} > {max_confidence_drift}"
+    return report
+
+
+if __name__ == "__main__":
+    from model_intents import DEFAULT_MODEL_DIR
+
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "export"
+    model_name = (DEFAULT_MODEL_DIR / "model_name.txt").read_text(encoding="utf-8").strip()
+    if cmd == "export":
+        source = sys.argv[2] if len(sys.argv) > 2 else model_name
+        # Le chargement compare la config à model_name.txt, pas au chemin exporté
+        export_onnx(source, DEFAULT_MODEL_DIR / ONNX_SUBDIR, model_name=model_name)
+    elif cmd == "parity":
+        with open("intents_data.json", "r", encoding="utf-8") as f:
+            patterns = [p for item in json.load(f) for p in item.get("patterns", []) if p.strip()]
+        for quantized in (False, True):
+            check_parity(patterns, DEFAULT_MODEL_DIR, quantized=quantized)
+    else:
+        print("Usage : python onnx_encoder.py [export [modèle] | parity]")
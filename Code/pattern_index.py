@@ -0,0 +1,70 @@
+"""
+pattern_index.py
+Table de correspondance exacte / quasi-exacte pattern → intention.
+Construite au chargement depuis intents_data.json : une question copiée
+depuis une suggestion (chip) est résolue sans aucun appel au modèle.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Callable, Optional
+
+from text_normalizer import fold
+
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def fold_key(s: str) -> str:
+    """Variante tolérante : minuscules, sans accents, sans ponctuation ni espaces."""
+    return _NON_WORD.sub("", fold(s))
+
+
+class PatternIndex:
+    """Deux tables de hachage : texte nettoyé exact, puis clé repliée."""
+
+    def __init__(self, exact: dict[str, str], folded: dict[str, str]):
+        self._exact = exact
+        self._folded = folded
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    @classmethod
+    def from_json(cls, json_path: str | Path, clean: Callable[[str], str]) -> "PatternIndex":
+        with open(json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        exact: dict[str, str] = {}
+        folded: dict[str, str] = {}
+        ambiguous: set[str] = set()
+
+        def add(table: dict, key: str, intent: str) -> None:
+            if not key:
+                return
+            if table.get(key, intent) != intent:
+                ambiguous.add(key)
+            table[key] = intent
+
+        for item in data:
+            intent = (item.get("intent") or "").strip()
+            for p in item.get("patterns", []):
+                if not p or not p.strip():
+                    continue
+                cleaned = clean(p)
+                add(exact, cleaned, intent)
+                add(folded, fold_key(cleaned), intent)
+                add(folded, fold_key(p), intent)
+
+        # Un même texte rattaché à plusieurs intentions → on laisse décider le modèle
+        for key in ambiguous:
+            exact.pop(key, None)
+            folded.pop(key, None)
+        return cls(exact, folded)
+
+    def lookup(self, text: str, cleaned: str) -> Optional[str]:
+        intent = self._exact.get(cleaned)
+        if intent is None:
+            intent = self._folded.get(fold_key(cleaned)) or self._folded.get(fold_key(text))
+        return intent
@@ -0,0 +1,15 @@
+# tests/conftest.py
+"""Les modules de l'application s'importent depuis Code/ (cf. app.py)."""
+
+import os
+import sys
+from pathlib import Path
+
+# Ni réseau, ni MongoDB, ni cache des traductions sur disque
+os.environ.setdefault("DATA_BACKEND", "local")
+os.environ.setdefault("TRANSLATION_BACKEND", "local")
+os.environ.setdefault("TRANSLATION_CACHE_DISK", "0")
+# translate_tree testé sur le backend seul ; le catalogue a ses propres tests
+os.environ.setdefault("MESSAGE_CATALOG_ENABLED", "0")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
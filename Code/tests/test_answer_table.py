@@ -0,0 +1,95 @@
+# tests/test_answer_table.py
+"""Table des réponses : les traductions partielles ne sont pas figées."""
+
+import time
+
+import pytest
+
+from logic import translator
+from logic.answer_table import AnswerFamily, AnswerTable
+from logic.translator import LocalBackend, translate_tree
+
+
+class SlowLeafBackend(LocalBackend):
+    """Un lot par texte ; le texte `slow` arrive après l'échéance."""
+
+    def __init__(self, slow: str, delay: float):
+        super().__init__()
+        self.slow, self.slow_delay = slow, delay
+
+    def split(self, texts):
+        return [[t] for t in texts]
+
+    def translate_batch(self, texts, lang):
+        if self.slow in texts:
+            time.sleep(self.slow_delay)
+        return super().translate_batch(texts, lang)
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    backend = SlowLeafBackend("Réponse lente", delay=0.3)
+    monkeypatch.setattr(translator, "_backend", backend)
+    monkeypatch.setattr(translator, "TRANSLATION_DEADLINE_S", 0.05)
+    monkeypatch.setattr(translator, "BREAKER", translator.CircuitBreaker(failures=100))
+    return backend
+
+
+def _answer(lang="fr"):
+    return translate_tree({"summary": "Réponse rapide", "details": ["Réponse lente"]}, lang)
+
+
+def test_partial_translation_is_rebuilt_on_next_warm(backend):
+    snapshot = object()
+    table = AnswerTable(families=(AnswerFamily(("answer",), _answer, _answer),),
+                        langs=("fr", "en"), snapshot=lambda: snapshot)
+
+    table.warm(background=False)
+    assert table.lookup("answer", "fr") == {"summary": "Réponse rapide", "details": ["Réponse lente"]}
+    # Lot « lent » hors délai : l'entrée anglaise n'est pas stockée à moitié traduite
+    assert table.lookup("answer", "en") is None
+
+    time.sleep(0.4)   # le lot tardif a rejoint le cache
+    table.warm(background=False)
+    assert table.lookup("answer", "en") == {"summary": "[en] Réponse rapide",
+                                            "details": ["[en] Réponse lente"]}
+
+
+def test_price_variants_are_translated_and_table_completes():
+    from logic.programmes import get_event_price_detailed, get_event_price_global
+
+    table = AnswerTable(families=(AnswerFamily(("price",), get_event_price_global, get_event_price_detailed,
+                                               variants=("concert", "atelier")),),
+                        langs=("fr", "en"), snapshot=object)
+    table.warm(background=False)
+    assert table.lookup("price", "en", question="prix du concert").startswith("[en] ")
+    assert table._complete
+
+
+def test_snapshot_reload_with_same_content_keeps_entries():
+    from logic.programme_snapshot import build_snapshot
+
+    groups = [{"_id": "28 Avril 2023", "events": [{"titre": "Ouverture", "date_iso": "2023-04-28"}]}]
+    snapshots = [build_snapshot(groups, None, {})]
+    renders = []
+
+    def render(lang="fr"):
+        renders.append(lang)
+        return f"{len(snapshots[-1].days)} jour(s)"
+
+    table = AnswerTable(families=(AnswerFamily(("days",), render, render, data_backed=True),),
+                        langs=("fr",), snapshot=lambda: snapshots[-1])
+    table.warm(background=False)
+    count = len(renders)
+
+    # Rechargement par TTL : nouvel objet, même contenu → rien n'est recalculé
+    snapshots.append(build_snapshot(groups, None, {}))
+    assert table.lookup("days") == "1 jour(s)"
+    table.warm(background=False)
+    assert len(renders) == count
+
+    # Contenu modifié → entrées « données » recalculées
+    snapshots.append(build_snapshot(groups + [{"_id": "4 Mai 2023", "events": [
+        {"titre": "Atelier", "date_iso": "2023-05-04"}]}], None, {}))
+    table.warm(background=False)
+    assert table.lookup("days") == "2 jour(s)"
@@ -0,0 +1,21 @@
+# tests/test_catalog.py
+"""Catalogue des messages : complet pour les sources actuelles, servi sans réseau."""
+
+from logic.catalog import TARGET_LANGS, MessageCatalog, extract, missing_translations, read_catalog
+
+
+def test_catalog_covers_every_extracted_message():
+    strings, _ = extract()
+    messages = read_catalog()["messages"]
+    assert sorted(set(strings) - set(messages)) == []
+    assert missing_translations() == {}
+
+
+def test_catalog_has_no_source_locations():
+    assert "sources" not in read_catalog()
+
+
+def test_lookup_from_compiled_catalog(tmp_path):
+    catalog = MessageCatalog(compiled=tmp_path / "messages.pickle")
+    assert catalog.load() == len(read_catalog()["messages"]) * len(TARGET_LANGS)
+    assert catalog.lookup_many(["Salle de Babel", "texte absent"], "en") == {"Salle de Babel": "Babel Hall"}
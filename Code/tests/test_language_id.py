@@ -0,0 +1,18 @@
+import pytest
+
+from language_id import DEFAULT_LANG, detect_language
+
+
+@pytest.mark.parametrize("text", ["merci beaucoup", "ok merci", "thanks"])
+def test_short_or_ambiguous_text_stays_french(text):
+    assert detect_language(text) == DEFAULT_LANG
+
+
+@pytest.mark.parametrize("text, lang", [
+    ("What are the opening hours of the fair?", "en"),
+    ("Wann beginnt die Messe?", "de"),
+    ("Quand commence la foire ?", "fr"),
+    ("詳細を教えてください", "ja"),
+])
+def test_detected_language(text, lang):
+    assert detect_language(text) == lang
@@ -0,0 +1,30 @@
+import pytest
+
+import keyword_matcher
+from mode_detector import DETAILED_HINTS_BY_LANG, detect_mode
+
+# Questions courtes (≤ 6 mots) : sans indice reconnu, l'heuristique répondrait « breve »
+DETAILED_QUESTIONS = {
+    "fr": "Donne-moi les détails",
+    "en": "Explain the schedule",
+    "de": "Bitte ausführlich erklären",
+    "ar": "اشرح لي البرنامج",
+    "ja": "詳細を教えてください",
+    "zh": "请给我详细的细节说明",
+}
+
+
+def test_every_hint_language_is_covered():
+    assert set(DETAILED_QUESTIONS) == set(DETAILED_HINTS_BY_LANG)
+
+
+@pytest.mark.parametrize("lang", sorted(DETAILED_QUESTIONS))
+def test_detailed_hint_detected(lang):
+    question = DETAILED_QUESTIONS[lang]
+    assert any(hit.group == "mode" for hit in keyword_matcher.scan(question))
+    assert detect_mode(question) == "detaille"
+
+
+@pytest.mark.parametrize("question", ["Où est la salle Babel ?", "Quel est le programme de la salle ?"])
+def test_hint_inside_a_word_is_ignored(question):
+    assert detect_mode(question) == "breve"
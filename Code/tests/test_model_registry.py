@@ -0,0 +1,43 @@
+# tests/test_model_registry.py
+"""Registre des modèles : un échange de fichiers en cours ne coupe pas le service."""
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import LabelEncoder
+
+from model_registry import ModelRegistry
+
+
+def _train(model_dir, labels):
+    encoder = LabelEncoder().fit(labels)
+    X = np.eye(len(labels))
+    classifier = LogisticRegression().fit(X, encoder.transform(labels))
+    (model_dir / "model_name.txt").write_text("encodeur-test", encoding="utf-8")
+    joblib.dump(classifier, model_dir / "classifier.joblib")
+    joblib.dump(encoder, model_dir / "label_encoder.joblib")
+
+
+@pytest.fixture
+def registry():
+    return ModelRegistry(encoder_factory=lambda name, model_dir: object(), check_interval=0.0)
+
+
+def test_missing_watched_file_keeps_serving_current_bundle(tmp_path, registry):
+    _train(tmp_path, ["horaires", "prix"])
+    bundle = registry.get(tmp_path)
+
+    # Échange du modèle : un fichier surveillé disparaît un instant
+    (tmp_path / "label_encoder.joblib").unlink()
+    assert registry.get(tmp_path) is bundle
+
+    _train(tmp_path, ["horaires", "prix", "programme"])
+    reloaded = registry.get(tmp_path)
+    assert reloaded is not bundle
+    assert list(reloaded.label_encoder.classes_) == ["horaires", "prix", "programme"]
+
+
+def test_missing_model_without_bundle_raises(tmp_path, registry):
+    with pytest.raises(FileNotFoundError):
+        registry.get(tmp_path)
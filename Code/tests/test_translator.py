@@ -0,0 +1,79 @@
+# tests/test_translator.py
+"""Disjoncteur et traduction groupée, contre le fournisseur factice (LocalBackend)."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from logic import translator
+from logic.translation_cache import TranslationCache
+from logic.translator import CircuitBreaker, LocalBackend, translate_missing, translate_tree
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """Pool dédié avec un seul emplacement, pour saturer facilement."""
+    executor = ThreadPoolExecutor(2)
+    slots = threading.BoundedSemaphore(1)
+    monkeypatch.setattr(translator, "_pool", lambda: (executor, slots))
+    yield executor, slots
+    executor.shutdown(wait=True)
+
+
+def test_tree_translated_in_one_batch():
+    backend, cache = LocalBackend(), TranslationCache(None)
+    tree = {"summary": "Salle de Babel", "details": [{"salle": "Salle de Babel", "heure": "11:00"},
+                                                     {"salle": "Ouvert au public"}]}
+    out = translate_tree(tree, "en", backend, cache)
+    assert backend.calls == 1
+    assert out["details"][0] == {"salle": "[en] Salle de Babel", "heure": "11:00"}
+    translate_tree(tree, "en", backend, cache)
+    assert backend.calls == 1
+
+
+def test_breaker_opens_after_consecutive_failures(pool):
+    clock = FakeClock()
+    breaker = CircuitBreaker(failures=2, cooldown=10, clock=clock)
+    cache, failing = TranslationCache(None), LocalBackend(fail=True)
+    for text in ("un texte", "deux textes"):
+        assert translate_missing([text], "en", failing, cache, breaker, deadline=1) == {}
+    assert breaker.state == "open"
+    # Circuit ouvert : le fournisseur n'est plus appelé
+    assert translate_missing(["trois textes"], "en", failing, cache, breaker, deadline=1) == {}
+    assert failing.calls == 2
+
+    clock.now += 10
+    assert translate_missing(["quatre textes"], "en", LocalBackend(), cache, breaker, deadline=1)
+    assert breaker.state == "closed"
+
+
+def test_half_open_trial_released_when_pool_is_saturated(pool):
+    _, slots = pool
+    clock = FakeClock()
+    breaker = CircuitBreaker(failures=1, cooldown=10, clock=clock)
+    cache = TranslationCache(None)
+
+    # Un lot lent dépasse l'échéance et garde l'unique emplacement : circuit ouvert
+    assert translate_missing(["lent"], "en", LocalBackend(delay=0.5), cache, breaker, deadline=0.05) == {}
+    assert breaker.state == "open"
+
+    # Après le délai, l'essai semi-ouvert ne peut rien soumettre…
+    clock.now += 10
+    assert translate_missing(["bloqué"], "en", LocalBackend(), cache, breaker, deadline=1) == {}
+    assert breaker.state == "half-open"
+
+    # …et ne doit pas bloquer le circuit une fois l'emplacement libéré
+    assert slots.acquire(timeout=2)
+    slots.release()
+    healthy = LocalBackend()
+    assert translate_missing(["rétabli"], "en", healthy, cache, breaker, deadline=1) == {"rétabli": "[en] rétabli"}
+    assert breaker.state == "closed"
@@ -0,0 +1,140 @@
+"""
+text_normalizer.py
+Normalisation de texte unique, partagée par tous les modules :
+- repli des accents via une table de traduction compilée (str.translate)
+  au lieu d'un NFD caractère par caractère ;
+- substitution des synonymes du modèle en UN seul passage regex ;
+- résultats mémoïsés : une même question n'est normalisée qu'une fois par
+  requête, quelle que soit l'étape (intention, mode, FAQ, mots-clés).
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import NamedTuple
+
+
+# ---------------------------------------------------------------------
+# Repli des accents
+# ---------------------------------------------------------------------
+# Plages couvertes par la table (Latin-1, Latin étendu A/B, Latin étendu
+# additionnel, ponctuation générale) ; tout autre caractère non ASCII passe
+# par le chemin NFD d'origine, ce qui garantit un résultat identique.
+_TABLE_RANGES = ((0x80, 0x250), (0x1E00, 0x1F00), (0x2000, 0x2070))
+
+
+def _fold_slow(text: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFD", text)
+                   if unicodedata.category(c) != "Mn")
+
+
+def _build_fold_table() -> dict[int, str]:
+    table = {}
+    for lo, hi in _TABLE_RANGES:
+        for cp in range(lo, hi):
+            c = chr(cp)
+            folded = _fold_slow(c)
+            if folded != c:
+                table[cp] = folded
+    return table
+
+
+_FOLD_TABLE = _build_fold_table()
+_OUTSIDE_TABLE = re.compile(r"[^\x00-\u024f\u1e00-\u1eff\u2000-\u206f]")
+
+
+def strip_accents(text: str) -> str:
+    """Supprime les diacritiques (équivalent à NFD + retrait des Mn)."""
+    if text.isascii():
+        return text
+    text = text.translate(_FOLD_TABLE)
+    if _OUTSIDE_TABLE.search(text):
+        text = _fold_slow(text)
+    return text
+
+
+@lru_cache(maxsize=1024)
+def fold(text: str) -> str:
+    """Minuscules + sans accents (mode_detector, mots-clés, FAQ)."""
+    return strip_accents((text or "").lower())
+
+
+_PUNCT = re.compile(r"[?.!,:;]")
+
+
+@lru_cache(maxsize=1024)
+def normalize_for_matching(text: str) -> str:
+    """Minuscules, sans accents ni ponctuation simple (FAQ, regex de nlp_engine)."""
+    return _PUNCT.sub("", fold(text)).strip()
+
+
+# ---------------------------------------------------------------------
+# Nettoyage pour le modèle d'intentions
+# ---------------------------------------------------------------------
+# Synonymes ramenés au vocabulaire d'entraînement (ordre = priorité)
+MODEL_SYNONYMS = {
+    "sessions": "programme",
+    "planning": "programme",
+    "événements": "programme",
+    "événement": "programme",
+    "agenda": "programme",
+    "plan": "programme",
+    "activité": "programme",
+    "activités": "programme",
+    "seances": "programme",
+    "event": "événement",
+    "journee": "jour",
+    "journée": "jour",
+    "journées": "jours",
+    "date": "jour",
+    "details": "détail",
+    "détails": "détail",
+    "participants": "visiteurs",
+    "intervenants": "orateurs",
+    "conférenciers": "orateurs",
+    "stands": "exposants",
+    "expositions": "exposants",
+    "localisation": "pays",
+    "emplacement": "stands",
+    "origine": "pays",
+    "fermeture": "fin",
+    "clôture": "fin",
+    "ouverture": "début",
+    "lancement": "début",
+    "inauguration": "début",
+}
+
+_NON_MODEL_CHARS = re.compile(r"[^a-zàâçéèêëîïôûùüÿñæœ0-9\s]")
+# Alternance dans l'ordre du dictionnaire : à position égale, la première clé
+# gagne, comme avec la suite de str.replace d'origine.
+_SYNONYMS_RE = re.compile("|".join(re.escape(k) for k in MODEL_SYNONYMS))
+_SPACES = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def clean_for_model(s: str) -> str:
+    """Texte tel que vu par l'encodeur et les classifiers (cf. model_intents.clean_text)."""
+    s = _NON_MODEL_CHARS.sub(" ", s.lower())
+    s = _SYNONYMS_RE.sub(lambda m: MODEL_SYNONYMS[m.group(0)], s)
+    return _SPACES.sub(" ", s).strip()
+
+
+# ---------------------------------------------------------------------
+# Normalisation d'une question (une fois par requête)
+# ---------------------------------------------------------------------
+class NormalizedQuestion(NamedTuple):
+    raw: str        # question telle que reçue (strip)
+    folded: str     # minuscules sans accents
+    matching: str   # folded sans ponctuation simple
+    cleaned: str    # entrée du modèle d'intentions
+
+
+@lru_cache(maxsize=512)
+def normalize_question(text: str) -> NormalizedQuestion:
+    raw = (text or "").strip()
+    return NormalizedQuestion(
+        raw=raw,
+        folded=fold(raw),
+        matching=normalize_for_matching(raw),
+        cleaned=clean_for_model(raw),
+    )